@@ -2,37 +2,91 @@
 
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
+import os
 import time
 import uuid
-from collections import defaultdict
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Dict, List
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Tuple
 
-from fastapi import Depends, FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import HTMLResponse
-import json
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+import orjson
 import yaml
 
 from .dag import DAG
-from .persistence import PersistenceProtocol, get_persistence_from_env
+from .persistence import DagWriteBatcher, PersistenceProtocol, get_persistence_from_env
 from .scheduler import Scheduler
 from .utils import setup_logging
 
 
 setup_logging()
 
+MAX_DAG_UPLOAD_BYTES = int(os.getenv("MAX_DAG_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+# libyaml's C loader when PyYAML was built with it, otherwise the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_json_upload(stream: BinaryIO) -> Tuple[Any, bytes | None]:
+	content = stream.read()
+	return orjson.loads(content), content
+
+
+def _load_yaml_upload(stream: BinaryIO) -> Tuple[Any, bytes | None]:
+	# libyaml reads the spooled upload incrementally instead of buffering it whole
+	return yaml.load(stream, Loader=_YAML_LOADER), None
+
+
+# Upload parsers keyed by file extension; each returns the parsed document and,
+# when the whole payload was read, the raw bytes so they can be stored as-is.
+_UPLOAD_LOADERS: Dict[str, Callable[[BinaryIO], Tuple[Any, bytes | None]]] = {
+	".json": _load_json_upload,
+	".yaml": _load_yaml_upload,
+	".yml": _load_yaml_upload,
+}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 	"""Manage application lifespan."""
 	app.state.persistence = get_persistence_from_env()
+	app.state.scheduler = Scheduler(app.state.persistence)
+	app.state.dag_writer = DagWriteBatcher(app.state.persistence)
+	app.state.dag_writer.start()
 	yield
+	await app.state.dag_writer.stop()
+
 
+app = FastAPI(
+	title="Distributed Workflow Orchestrator",
+	version="1.0.0",
+	lifespan=lifespan,
+	default_response_class=ORJSONResponse,
+)
 
-app = FastAPI(title="Distributed Workflow Orchestrator", version="1.0.0", lifespan=lifespan)
+# Data versions restart at zero with each process, so ETags carry a per-process
+# token to keep a restarted server from matching a client's stale validator.
+_ETAG_EPOCH = uuid.uuid4().hex[:12]
 
+# Last metrics response as (computed_at, persistence, data_version, metrics) so
+# concurrent dashboard polls within the TTL share one aggregation pass.
+_METRICS_TTL_SECONDS = 0.5
+_metrics_cache: Tuple[float, PersistenceProtocol, int | None, dict] | None = None
 
-def get_persistence() -> PersistenceProtocol:
+# /events polls the data version this often, which also bounds how many updates
+# are coalesced into one event.
+_EVENTS_POLL_SECONDS = 0.2
+_EVENTS_FALLBACK_SECONDS = 5.0
+_EVENTS_KEEPALIVE_SECONDS = 15.0
+
+
+# Dependencies are coroutines so FastAPI resolves them inline on the event loop
+# instead of dispatching each one to the threadpool on every request.
+async def get_persistence() -> PersistenceProtocol:
 	persistence = getattr(app.state, "persistence", None)
 	if persistence is None:
 		persistence = get_persistence_from_env()
@@ -40,12 +94,47 @@ def get_persistence() -> PersistenceProtocol:
 	return persistence
 
 
+async def get_scheduler(persistence: PersistenceProtocol = Depends(get_persistence)) -> Scheduler:
+	scheduler = getattr(app.state, "scheduler", None)
+	if scheduler is None or scheduler.persistence is not persistence:
+		scheduler = Scheduler(persistence)
+		app.state.scheduler = scheduler
+	return scheduler
+
+
+async def _save_dag(persistence: PersistenceProtocol, dag: DAG, dag_json: str | bytes | None = None) -> None:
+	"""Persist a DAG, batching serialized writes for durable backends."""
+
+	if not persistence.durable:
+		persistence.save_dag_obj(dag.id, dag)
+		return
+	if dag_json is None:
+		dag_json = dag.to_json_bytes()
+	writer: DagWriteBatcher | None = getattr(app.state, "dag_writer", None)
+	if writer is not None and writer.running and writer.persistence is persistence:
+		await writer.save_dag(dag.id, dag_json)
+	else:
+		await run_in_threadpool(persistence.save_dag, dag.id, dag_json)
+
+
+def _check_not_modified(request: Request, response: Response, persistence: PersistenceProtocol) -> Response | None:
+	"""Return a 304 response when the client already holds the current data version."""
+
+	version = persistence.data_version()
+	if version is None:
+		return None
+	etag = f'W/"{_ETAG_EPOCH}-{version}"'
+	if request.headers.get("if-none-match") == etag:
+		return Response(status_code=304, headers={"etag": etag})
+	response.headers["etag"] = etag
+	return None
+
+
 @app.post("/dags")
-def register_dag(dag: DAG, persistence: PersistenceProtocol = Depends(get_persistence)) -> dict:
+async def register_dag(dag: DAG, persistence: PersistenceProtocol = Depends(get_persistence)) -> dict:
 	"""Register or update a DAG definition."""
 
-	dag.validate()
-	persistence.save_dag(dag.id, dag.model_dump_json())
+	await _save_dag(persistence, dag)
 	return {"dag_id": dag.id}
 
 
@@ -56,49 +145,53 @@ async def upload_dag(
 ) -> dict:
 	"""Upload and register a DAG from JSON or YAML file."""
 	
-	content = await file.read()
-	filename = file.filename.lower()
+	size = file.size
+	if size is None:
+		size = file.file.seek(0, os.SEEK_END)
+		file.file.seek(0)
+	if size > MAX_DAG_UPLOAD_BYTES:
+		raise HTTPException(
+			status_code=413,
+			detail=f"File too large. Maximum upload size is {MAX_DAG_UPLOAD_BYTES} bytes."
+		)
 	
-	try:
-		# Parse based on file extension
-		if filename.endswith('.json'):
-			data = json.loads(content.decode('utf-8'))
-		elif filename.endswith(('.yaml', '.yml')):
-			data = yaml.safe_load(content.decode('utf-8'))
-		else:
-			raise HTTPException(
-				status_code=400,
-				detail="Unsupported file format. Please upload JSON or YAML files."
-			)
-		
-		# Create DAG from parsed data
-		dag = DAG(**data)
-		dag.validate()
-		persistence.save_dag(dag.id, dag.model_dump_json())
-		
-		return {"dag_id": dag.id, "filename": file.filename, "status": "uploaded"}
+	loader = _UPLOAD_LOADERS.get(os.path.splitext(file.filename or "")[1].lower())
+	if loader is None:
+		raise HTTPException(
+			status_code=400,
+			detail="Unsupported file format. Please upload JSON or YAML files."
+		)
 	
-	except json.JSONDecodeError as e:
+	try:
+		data, content = await run_in_threadpool(loader, file.file)
+		dag = DAG.model_validate(data)
+	except orjson.JSONDecodeError as e:
 		raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
 	except yaml.YAMLError as e:
 		raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
 	except ValueError as e:
 		raise HTTPException(status_code=400, detail=f"Invalid DAG: {str(e)}")
-	except Exception as e:
-		raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+	
+	# JSON uploads were just validated, so durable backends can store the original bytes as-is
+	await _save_dag(persistence, dag, content)
+	
+	return {"dag_id": dag.id, "filename": file.filename, "status": "uploaded"}
 
 
 @app.post("/dags/{dag_id}/run")
-def trigger_run(dag_id: str, persistence: PersistenceProtocol = Depends(get_persistence)) -> dict:
+def trigger_run(
+	dag_id: str,
+	persistence: PersistenceProtocol = Depends(get_persistence),
+	scheduler: Scheduler = Depends(get_scheduler),
+) -> dict:
 	"""Create a new run for a stored DAG."""
 
-	dag_json = persistence.load_dag(dag_id)
-	if not dag_json:
+	dag = persistence.load_dag_obj(dag_id)
+	if dag is None:
 		raise HTTPException(status_code=404, detail="DAG not found")
 
-	dag = DAG.model_validate_json(dag_json)
-	run_id = str(uuid.uuid4())
-	Scheduler(persistence).schedule_dag(dag, run_id)
+	run_id = uuid.uuid4().hex
+	scheduler.schedule_dag(dag, run_id)
 	return {"run_id": run_id}
 
 
@@ -111,9 +204,9 @@ def get_run(run_id: str, persistence: PersistenceProtocol = Depends(get_persiste
 		raise HTTPException(status_code=404, detail="Run not found")
 
 	task_ids: List[str] = run_meta.get("task_ids", [])
+	statuses = persistence.get_task_statuses([f"{run_id}:{task_id}" for task_id in task_ids])
 	tasks = []
-	for task_id in task_ids:
-		status = persistence.get_task_status(f"{run_id}:{task_id}")
+	for task_id, status in zip(task_ids, statuses):
 		tasks.append({"task_id": task_id, **status} if status else {"task_id": task_id, "status": "pending"})
 
 	return {"run_id": run_id, "metadata": run_meta, "tasks": tasks}
@@ -123,36 +216,45 @@ def get_run(run_id: str, persistence: PersistenceProtocol = Depends(get_persiste
 def get_task(task_run_id: str, persistence: PersistenceProtocol = Depends(get_persistence)) -> dict:
 	"""Return detailed task execution logs."""
 
-	status = persistence.get_task_status(task_run_id)
+	status = persistence.get_task_status(task_run_id) or _queued_attempt(persistence, task_run_id)
 	if not status:
 		raise HTTPException(status_code=404, detail="Task not found")
 	return status
 
 
+def _queued_attempt(persistence: PersistenceProtocol, task_run_id: str) -> dict:
+	"""Return the canonical record of an attempt that is queued but has no attempt key yet."""
+
+	status = persistence.get_task_status(task_run_id.rpartition(":")[0])
+	return status if status.get("task_run_id") == task_run_id else {}
+
+
 @app.get("/dags")
-def list_dags(persistence: PersistenceProtocol = Depends(get_persistence)) -> dict:
+def list_dags(
+	request: Request,
+	response: Response,
+	persistence: PersistenceProtocol = Depends(get_persistence),
+) -> dict:
 	"""List all registered DAGs."""
-	# In-memory persistence stores DAGs; for Redis we'd scan keys
-	if hasattr(persistence, "_dags"):
-		dag_ids = list(persistence._dags.keys())
-	else:
-		# For Redis: scan pattern orchestrator:dag:*
-		dag_ids = []
+	not_modified = _check_not_modified(request, response, persistence)
+	if not_modified is not None:
+		return not_modified
+	dag_ids = persistence.list_dag_ids()
 	return {"dags": dag_ids, "count": len(dag_ids)}
 
 
 @app.get("/runs")
-def list_runs(limit: int = 20, persistence: PersistenceProtocol = Depends(get_persistence)) -> dict:
+def list_runs(
+	request: Request,
+	response: Response,
+	limit: int = Query(20, ge=0),
+	persistence: PersistenceProtocol = Depends(get_persistence),
+) -> dict:
 	"""List recent runs with status."""
-	# Simplified: scan statuses starting with 'run:'
-	if hasattr(persistence, "_statuses"):
-		runs = [
-			{"run_id": key.replace("run:", ""), **status}
-			for key, status in persistence._statuses.items()
-			if key.startswith("run:")
-		][:limit]
-	else:
-		runs = []
+	not_modified = _check_not_modified(request, response, persistence)
+	if not_modified is not None:
+		return not_modified
+	runs = persistence.scan_runs(limit)
 	return {"runs": runs, "count": len(runs)}
 
 
@@ -163,17 +265,16 @@ def cancel_run(run_id: str, persistence: PersistenceProtocol = Depends(get_persi
 	if not run_meta:
 		raise HTTPException(status_code=404, detail="Run not found")
 	
-	# Mark run as cancelled
+	# Mark run and all queued/running tasks as cancelled in a single batch
 	run_meta["status"] = "cancelled"
-	persistence.save_task_status(f"run:{run_id}", "cancelled", run_meta)
-	
-	# Mark all queued/running tasks as cancelled
+	updates = [(f"run:{run_id}", "cancelled", run_meta)]
 	task_ids: List[str] = run_meta.get("task_ids", [])
-	for task_id in task_ids:
-		status = persistence.get_task_status(f"{run_id}:{task_id}")
+	statuses = persistence.get_task_statuses([f"{run_id}:{task_id}" for task_id in task_ids])
+	for task_id, status in zip(task_ids, statuses):
 		if status and status.get("status") in ["queued", "running"]:
 			status["status"] = "cancelled"
-			persistence.save_task_status(f"{run_id}:{task_id}", "cancelled", status)
+			updates.append((f"{run_id}:{task_id}", "cancelled", status))
+	persistence.save_task_statuses(updates)
 	
 	return {"run_id": run_id, "status": "cancelled"}
 
@@ -187,51 +288,85 @@ def get_task_retries(task_run_id: str, persistence: PersistenceProtocol = Depend
 		raise HTTPException(status_code=400, detail="Invalid task_run_id format")
 	
 	base_key = parts[0]
-	retries = []
-	
-	# Scan for all attempts
-	if hasattr(persistence, "_statuses"):
-		for key, status in persistence._statuses.items():
-			if key.startswith(base_key + ":"):
-				retries.append({"task_run_id": key, **status})
-	
-	retries.sort(key=lambda x: x.get("task_run_id", ""))
+	retries = persistence.scan_task_retries(base_key)
+	current = persistence.get_task_status(base_key)
+	current_run_id = current.get("task_run_id")
+	if current_run_id and all(entry["task_run_id"] != current_run_id for entry in retries):
+		# The latest attempt is still queued, so only its canonical record exists
+		retries.append(current)
 	return {"task_run_id": task_run_id, "retries": retries, "count": len(retries)}
 
 
 @app.get("/metrics")
-def get_metrics(persistence: PersistenceProtocol = Depends(get_persistence)) -> dict:
+def get_metrics(
+	request: Request,
+	response: Response,
+	persistence: PersistenceProtocol = Depends(get_persistence),
+) -> dict:
 	"""Get system metrics and statistics."""
-	metrics: Dict[str, Any] = {
-		"timestamp": time.time(),
-		"dags_registered": 0,
-		"runs_total": 0,
-		"tasks_by_status": defaultdict(int),
-		"queue_depth": 0,
-	}
-	
-	if hasattr(persistence, "_dags"):
-		metrics["dags_registered"] = len(persistence._dags)
-	
-	if hasattr(persistence, "_statuses"):
-		for key, status in persistence._statuses.items():
-			if key.startswith("run:"):
-				metrics["runs_total"] += 1
-			elif ":" in key and not key.startswith("run:"):
-				task_status = status.get("status", "unknown")
-				metrics["tasks_by_status"][task_status] += 1
-	
-	if hasattr(persistence, "_queue"):
-		metrics["queue_depth"] = persistence._queue.qsize()
-	
-	metrics["tasks_by_status"] = dict(metrics["tasks_by_status"])
+	not_modified = _check_not_modified(request, response, persistence)
+	if not_modified is not None:
+		return not_modified
+	return _current_metrics(persistence)
+
+
+def _current_metrics(persistence: PersistenceProtocol) -> dict:
+	"""Return metrics, reusing the last snapshot within the TTL when data is unchanged."""
+
+	global _metrics_cache
+	now = time.monotonic()
+	version = persistence.data_version()
+	cached = _metrics_cache
+	if (
+		cached is not None
+		and cached[1] is persistence
+		and cached[2] == version
+		and now - cached[0] < _METRICS_TTL_SECONDS
+	):
+		return cached[3]
+	metrics = {"timestamp": time.time(), **persistence.metrics_snapshot()}
+	_metrics_cache = (now, persistence, version, metrics)
 	return metrics
 
 
-@app.get("/", response_class=HTMLResponse)
-def dashboard() -> str:
-	"""Dashboard UI for monitoring workflows."""
-	return """
+async def _event_stream(request: Request, persistence: PersistenceProtocol) -> AsyncIterator[bytes]:
+	"""Yield a metrics event whenever the data version changes.
+
+	Changes within one poll interval are coalesced into a single event. Backends
+	without a data version fall back to a fixed refresh interval.
+	"""
+
+	last_version: int | None = None
+	last_sent: float | None = None
+	while not await request.is_disconnected():
+		now = time.monotonic()
+		version = persistence.data_version()
+		if version is None:
+			due = last_sent is None or now - last_sent >= _EVENTS_FALLBACK_SECONDS
+		else:
+			due = last_sent is None or version != last_version
+		if due:
+			metrics = await run_in_threadpool(_current_metrics, persistence)
+			yield b"data: " + orjson.dumps(metrics) + b"\n\n"
+			last_version, last_sent = version, now
+		elif now - last_sent >= _EVENTS_KEEPALIVE_SECONDS:
+			yield b": keep-alive\n\n"
+			last_sent = now
+		await asyncio.sleep(_EVENTS_POLL_SECONDS)
+
+
+@app.get("/events")
+async def events(request: Request, persistence: PersistenceProtocol = Depends(get_persistence)) -> StreamingResponse:
+	"""Stream metrics to the dashboard as server-sent events when data changes."""
+
+	return StreamingResponse(
+		_event_stream(request, persistence),
+		media_type="text/event-stream",
+		headers={"cache-control": "no-cache"},
+	)
+
+
+_DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -1012,27 +1147,29 @@ def dashboard() -> str:
 		async function loadMetrics() {
 			try {
 				const res = await fetch('/metrics');
-				const data = await res.json();
-				
-				// Update quick stats
-				updateQuickStats(data);
-				
-				const statusHtml = Object.entries(data.tasks_by_status || {})
-					.map(([status, count]) => `<span class="status-badge status-${status}">${status}: ${count}</span>`)
-					.join('');
-				document.getElementById('metrics-content').innerHTML = `
-					<div class="metric">${data.dags_registered}</div>
-					<div>Registered DAGs</div>
-					<div class="metric" style="font-size: 1.8em; margin-top: 15px;">${data.runs_total}</div>
-					<div>Total Runs</div>
-					<div style="margin-top: 15px;">${statusHtml || '<span class="empty-state">No tasks yet</span>'}</div>
-					<div class="timestamp">Queue: ${data.queue_depth} tasks • Last updated: ${new Date().toLocaleTimeString()}</div>
-				`;
+				renderMetrics(await res.json());
 			} catch (e) {
 				document.getElementById('metrics-content').innerHTML = '<div class="empty-state">Failed to load</div>';
 			}
 		}
 		
+		function renderMetrics(data) {
+			// Update quick stats
+			updateQuickStats(data);
+			
+			const statusHtml = Object.entries(data.tasks_by_status || {})
+				.map(([status, count]) => `<span class="status-badge status-${status}">${status}: ${count}</span>`)
+				.join('');
+			document.getElementById('metrics-content').innerHTML = `
+				<div class="metric">${data.dags_registered}</div>
+				<div>Registered DAGs</div>
+				<div class="metric" style="font-size: 1.8em; margin-top: 15px;">${data.runs_total}</div>
+				<div>Total Runs</div>
+				<div style="margin-top: 15px;">${statusHtml || '<span class="empty-state">No tasks yet</span>'}</div>
+				<div class="timestamp">Queue: ${data.queue_depth} tasks • Last updated: ${new Date().toLocaleTimeString()}</div>
+			`;
+		}
+		
 		async function loadDAGs() {
 			try {
 				const res = await fetch('/dags');
@@ -1215,8 +1352,21 @@ def dashboard() -> str:
 		// Load on page load
 		loadAll();
 		
-		// Auto-refresh every 5 seconds
-		setInterval(loadAll, 5000);
+		// Refresh only when the server reports a change; the event carries the metrics
+		if (window.EventSource) {
+			let lastDagCount = null;
+			new EventSource('/events').onmessage = (e) => {
+				const data = JSON.parse(e.data);
+				renderMetrics(data);
+				if (data.dags_registered !== lastDagCount) {
+					lastDagCount = data.dags_registered;
+					loadDAGs();
+				}
+				loadRuns();
+			};
+		} else {
+			setInterval(loadAll, 5000);
+		}
 		
 		// Smooth scroll for anchor links
 		document.querySelectorAll('a[href^="#"]').forEach(anchor => {
@@ -1275,6 +1425,36 @@ def dashboard() -> str:
 </body>
 </html>
 """
+_DASHBOARD_BYTES = _DASHBOARD_HTML.encode("utf-8")
+_DASHBOARD_DIGEST = hashlib.md5(_DASHBOARD_BYTES, usedforsecurity=False).hexdigest()
+_DASHBOARD_HEADERS = {
+	"content-length": str(len(_DASHBOARD_BYTES)),
+	"cache-control": "public, max-age=3600",
+	"vary": "Accept-Encoding",
+	"etag": f'"{_DASHBOARD_DIGEST}"',
+}
+_DASHBOARD_GZIP = gzip.compress(_DASHBOARD_BYTES, compresslevel=9, mtime=0)
+_DASHBOARD_GZIP_HEADERS = {
+	**_DASHBOARD_HEADERS,
+	"content-length": str(len(_DASHBOARD_GZIP)),
+	"content-encoding": "gzip",
+	"etag": f'"{_DASHBOARD_DIGEST}-gzip"',
+}
+
+
+@app.get("/", response_class=HTMLResponse)
+def dashboard(request: Request) -> Response:
+	"""Dashboard UI for monitoring workflows."""
+	if "gzip" in request.headers.get("accept-encoding", ""):
+		body, headers = _DASHBOARD_GZIP, _DASHBOARD_GZIP_HEADERS
+	else:
+		body, headers = _DASHBOARD_BYTES, _DASHBOARD_HEADERS
+	if request.headers.get("if-none-match") == headers["etag"]:
+		return Response(
+			status_code=304,
+			headers={key: headers[key] for key in ("cache-control", "vary", "etag")},
+		)
+	return Response(content=body, media_type="text/html", headers=headers)
 
 
 @app.get("/health")
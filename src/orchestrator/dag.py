@@ -1,9 +1,10 @@
 """DAG and Task models along with validation helpers."""
 
 from collections import deque
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 class CycleError(ValueError):
@@ -13,13 +14,15 @@ class CycleError(ValueError):
 class Task(BaseModel):
 	"""Definition of an individual DAG task."""
 
+	model_config = ConfigDict(frozen=True)
+
 	id: str
 	name: str
 	command: Optional[str] = None
 	callable: Optional[str] = None
 	retries: int = 0
 	retry_delay_seconds: int = 5
-	dependencies: List[str] = Field(default_factory=list)
+	dependencies: Tuple[str, ...] = ()
 	timeout_seconds: Optional[int] = None
 	metadata: Dict[str, Any] = Field(default_factory=dict)
 
@@ -40,15 +43,34 @@ class Task(BaseModel):
 		return self
 
 
+_GRAPH_CACHES = ("downstream", "topological_order")
+
+
 class DAG(BaseModel):
 	"""Directed acyclic graph describing task relationships."""
 
+	model_config = ConfigDict(frozen=True)
+
 	id: str
 	name: str
 	tasks: Dict[str, Task]
 
+	@model_validator(mode="after")
+	def _check_graph(self) -> "DAG":
+		self.validate()
+		return self
+
+	def to_json_bytes(self) -> bytes:
+		"""Serialize the DAG straight to JSON bytes, skipping the intermediate str."""
+
+		return self.__pydantic_serializer__.to_json(self)
+
 	def validate(self) -> None:
-		"""Validate dependencies and ensure the DAG is acyclic."""
+		"""Validate dependencies and ensure the DAG is acyclic.
+
+		Runs automatically when the model is constructed; call it explicitly only for
+		instances built with ``model_construct``, which skips validation.
+		"""
 
 		task_ids = set(self.tasks)
 		for task in self.tasks.values():
@@ -58,39 +80,49 @@ class DAG(BaseModel):
 					f"Task '{task.id}' references undefined dependencies: {sorted(missing)}"
 				)
 
-		if self._has_cycle():
-			raise CycleError(f"DAG '{self.id}' contains a cycle")
+		try:
+			# Uncached, so a DAG whose ``tasks`` were changed in place is re-checked
+			self._kahn_order(self._build_downstream())
+		except CycleError:
+			raise CycleError(f"DAG '{self.id}' contains a cycle") from None
 
-	def _has_cycle(self) -> bool:
-		indegree: Dict[str, int] = {task_id: 0 for task_id in self.tasks}
-		for task in self.tasks.values():
-			for dep in task.dependencies:
-				indegree[task.id] += 1
+	def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "DAG":
+		"""Copy the DAG, dropping memoized graph data that ``update`` may have invalidated.
 
-		queue = deque(task_id for task_id, degree in indegree.items() if degree == 0)
-		visited = 0
+		As with any pydantic ``model_copy``, the copy is not re-validated.
+		"""
 
-		while queue:
-			current = queue.popleft()
-			visited += 1
-			for task in self.tasks.values():
-				if current in task.dependencies:
-					indegree[task.id] -= 1
-					if indegree[task.id] == 0:
-						queue.append(task.id)
+		copied = super().model_copy(update=update, deep=deep)
+		for name in _GRAPH_CACHES:
+			copied.__dict__.pop(name, None)
+		return copied
+
+	@cached_property
+	def downstream(self) -> Dict[str, Tuple[str, ...]]:
+		"""Read-only downstream adjacency, computed once per (frozen) DAG instance."""
+
+		return self._build_downstream()
 
-		return visited != len(self.tasks)
+	@cached_property
+	def topological_order(self) -> Tuple[str, ...]:
+		"""Memoized result of :meth:`topological_sort`."""
+
+		return tuple(self._kahn_order(self.downstream))
 
 	def topological_sort(self) -> List[str]:
 		"""Return tasks ordered by dependency prerequisites."""
 
-		indegree: Dict[str, int] = {task_id: 0 for task_id in self.tasks}
-		adjacency: Dict[str, List[str]] = {task_id: [] for task_id in self.tasks}
+		return list(self.topological_order)
 
+	def _build_downstream(self) -> Dict[str, Tuple[str, ...]]:
+		adjacency: Dict[str, List[str]] = {task_id: [] for task_id in self.tasks}
 		for task in self.tasks.values():
 			for dep in task.dependencies:
 				adjacency[dep].append(task.id)
-				indegree[task.id] += 1
+		return {task_id: tuple(children) for task_id, children in adjacency.items()}
+
+	def _kahn_order(self, adjacency: Dict[str, Tuple[str, ...]]) -> List[str]:
+		indegree: Dict[str, int] = {task.id: len(task.dependencies) for task in self.tasks.values()}
 
 		queue = deque(task_id for task_id, degree in indegree.items() if degree == 0)
 		order: List[str] = []
@@ -110,19 +142,20 @@ class DAG(BaseModel):
 
 
 def build_run_tasks(dag: DAG, run_id: str) -> List[Dict[str, Any]]:
-	"""Build per-run task payloads for enqueuing."""
+	"""Build per-run task payloads for enqueuing.
+
+	Payloads share the task's ``dependencies`` and ``metadata`` objects rather than
+	copying them; treat them as read-only.
+	"""
 
-	dag.validate()
-	adjacency: Dict[str, List[str]] = {task_id: [] for task_id in dag.tasks}
-	for task in dag.tasks.values():
-		for dep in task.dependencies:
-			adjacency[dep].append(task.id)
+	adjacency = dag.downstream
 	payloads: List[Dict[str, Any]] = []
 	for task_id, task in dag.tasks.items():
-		dependencies = list(task.dependencies)
+		canonical_key = f"{run_id}:{task_id}"
 		payloads.append(
 			{
-				"task_run_id": f"{run_id}:{task_id}:0",
+				"task_run_id": f"{canonical_key}:0",
+				"canonical_key": canonical_key,
 				"run_id": run_id,
 				"task_id": task_id,
 				"dag_id": dag.id,
@@ -131,10 +164,25 @@ def build_run_tasks(dag: DAG, run_id: str) -> List[Dict[str, Any]]:
 				"attempt": 0,
 				"retries": task.retries,
 				"retry_delay_seconds": task.retry_delay_seconds,
-				"dependencies": dependencies,
+				"dependencies": task.dependencies,
 				"downstream": adjacency[task_id],
 				"timeout_seconds": task.timeout_seconds,
-				"metadata": dict(task.metadata),
+				"metadata": task.metadata,
 			}
 		)
 	return payloads
+
+
+def task_queue_ref(payload: Dict[str, Any]) -> Dict[str, Any]:
+	"""Return the per-attempt fields of a run task payload, for enqueuing.
+
+	Workers rebuild the full payload from the run blueprint, so queue items only
+	carry what differs between attempts.
+	"""
+
+	return {
+		"run_id": payload["run_id"],
+		"task_id": payload["task_id"],
+		"task_run_id": payload["task_run_id"],
+		"attempt": payload["attempt"],
+	}
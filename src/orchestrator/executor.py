@@ -3,17 +3,34 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import json
 import multiprocessing
+import os
+import re
+import shlex
 import subprocess
+import threading
 import time
 import traceback
-from multiprocessing import Process, Queue
-from typing import Any, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional
+
+import orjson
 
 from .utils import human_readable_duration, safe_import
 
 
+# Commands containing shell syntax still go through ``/bin/sh -c``; plain
+# argument lists are executed directly to skip the extra shell process.
+_SHELL_SYNTAX = re.compile(r"[|&;<>()$`*?\[\]{}~#!\n]")
+
+_callable_pool: ProcessPoolExecutor | None = None
+_callable_pool_lock = threading.Lock()
+
+
 def _invoke_callable(func: Any, metadata: Dict[str, Any]) -> Any:
 	if asyncio.iscoroutinefunction(func):
 		return asyncio.run(_invoke_async(func, metadata))
@@ -28,24 +45,137 @@ def _invoke_sync(func: Any, metadata: Dict[str, Any]) -> Any:
 	return _call_with_metadata(func, metadata)
 
 
+@lru_cache(maxsize=1024)
+def _accepts_kwargs(func: Any, keys: FrozenSet[str]) -> Optional[bool]:
+	"""Whether ``func`` binds ``keys`` as keyword arguments; ``None`` if it has no signature."""
+
+	try:
+		signature = inspect.signature(func)
+	except (TypeError, ValueError):
+		return None
+	try:
+		signature.bind(**dict.fromkeys(keys))
+	except TypeError:
+		return False
+	return True
+
+
 def _call_with_metadata(func: Any, metadata: Dict[str, Any]) -> Any:
-	if metadata:
+	if not metadata:
+		return func()
+	try:
+		accepts_kwargs = _accepts_kwargs(func, frozenset(metadata))
+	except TypeError:  # unhashable callable object
+		accepts_kwargs = None
+	if accepts_kwargs is None:
 		try:
 			return func(**metadata)
 		except TypeError:
 			return func(metadata)
-	return func()
+	return func(**metadata) if accepts_kwargs else func(metadata)
+
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _encode_output(output: Any) -> bytes:
+	try:
+		return orjson.dumps(output, default=str, option=_ORJSON_OPTIONS)
+	except orjson.JSONEncodeError:
+		# e.g. integers wider than 64 bits, which only the stdlib encoder supports
+		return json.dumps(output, default=str).encode("utf-8")
+
 
+def _run_callable_worker(callable_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+	"""Execute the callable inside a pooled worker process.
 
-def _run_callable_worker(callable_path: str, metadata: Dict[str, Any], result_queue: Queue) -> None:
-	"""Execute the callable inside a separate process."""
+	The result is encoded here, where it is known to be serializable, and sent back as
+	UTF-8 bytes so the pool's pickling step copies a flat buffer instead of re-encoding
+	a ``str`` or walking the raw object graph.
+	"""
 
 	try:
 		func = safe_import(callable_path)
 		output = _invoke_callable(func, metadata)
-		result_queue.put({"exit_code": 0, "stdout": json.dumps(output, default=str), "stderr": ""})
-	except Exception:  # pragma: no cover - defensive path
-		result_queue.put({"exit_code": 1, "stdout": "", "stderr": traceback.format_exc()})
+		return {"exit_code": 0, "stdout": _encode_output(output), "stderr": ""}
+	except BaseException:  # sys.exit() in a task must not escape into the worker
+		return {"exit_code": 1, "stdout": "", "stderr": traceback.format_exc()}
+
+
+def _get_callable_pool() -> ProcessPoolExecutor:
+	global _callable_pool
+	with _callable_pool_lock:
+		if _callable_pool is None:
+			_callable_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+		return _callable_pool
+
+
+def _discard_callable_pool(pool: ProcessPoolExecutor) -> None:
+	"""Drop a broken ``pool`` so the next callable gets fresh workers."""
+
+	global _callable_pool
+	with _callable_pool_lock:
+		if _callable_pool is pool:
+			_callable_pool = None
+	pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _send_callable_result(sender: Any, callable_path: str, metadata: Dict[str, Any]) -> None:
+	sender.send(_run_callable_worker(callable_path, metadata))
+	sender.close()
+
+
+def _run_timed_callable(callable_path: str, metadata: Dict[str, Any], timeout: float) -> Dict[str, Any] | None:
+	"""Run a callable in its own process so a timeout kills nothing but that process.
+
+	Returns ``None`` on timeout and raises ``EOFError`` if the process died without a result.
+	"""
+
+	context = multiprocessing.get_context()
+	receiver, sender = context.Pipe(duplex=False)
+	process = context.Process(target=_send_callable_result, args=(sender, callable_path, metadata), daemon=True)
+	process.start()
+	sender.close()
+	try:
+		if not receiver.poll(timeout):
+			process.terminate()
+			return None
+		return receiver.recv()
+	finally:
+		receiver.close()
+		process.join()
+
+
+def _command_args(command: str) -> List[str] | None:
+	"""Split ``command`` into argv when it needs no shell features, else ``None``."""
+
+	if _SHELL_SYNTAX.search(command):
+		return None
+	try:
+		args = shlex.split(command)
+	except ValueError:
+		return None
+	return args or None
+
+
+def _run_command(command: str, timeout: Optional[int]) -> subprocess.CompletedProcess[str]:
+	args = _command_args(command)
+	while True:
+		try:
+			return subprocess.run(
+				args if args is not None else command,
+				shell=args is None,
+				capture_output=True,
+				text=True,
+				timeout=timeout,
+				check=False,
+			)
+		except OSError:
+			if args is None:
+				raise
+			# Builtins, ``VAR=value cmd`` forms, non-executable files and scripts without a
+			# shebang only run (or fail with a proper exit code) through the shell.
+			args = None
 
 
 def execute_task(task_payload: Dict[str, Any], timeout: Optional[int]) -> Dict[str, Any]:
@@ -60,14 +190,7 @@ def execute_task(task_payload: Dict[str, Any], timeout: Optional[int]) -> Dict[s
 
 	if command:
 		try:
-			completed = subprocess.run(
-				command,
-				shell=True,
-				capture_output=True,
-				text=True,
-				timeout=timeout,
-				check=False,
-			)
+			completed = _run_command(command, timeout)
 			duration = human_readable_duration(time.monotonic() - started)
 			status = "success" if completed.returncode == 0 else "failed"
 			return {
@@ -77,6 +200,14 @@ def execute_task(task_payload: Dict[str, Any], timeout: Optional[int]) -> Dict[s
 				"duration": duration,
 				"exit_code": completed.returncode,
 			}
+		except OSError as exc:
+			return {
+				"status": "failed",
+				"stdout": "",
+				"stderr": f"Command could not be started: {exc}",
+				"duration": human_readable_duration(time.monotonic() - started),
+				"exit_code": 126,
+			}
 		except subprocess.TimeoutExpired:
 			return {
 				"status": "timeout",
@@ -87,40 +218,39 @@ def execute_task(task_payload: Dict[str, Any], timeout: Optional[int]) -> Dict[s
 			}
 
 	assert callable_path  # already validated above
-	result_queue: Queue = multiprocessing.Queue()
-	process: Process = Process(
-		target=_run_callable_worker,
-		args=(callable_path, task_payload.get("metadata", {}), result_queue),
-	)
-	process.start()
-	process.join(timeout)
-
-	if process.is_alive():
-		process.terminate()
+	metadata = task_payload.get("metadata", {})
+	pool = None
+	try:
+		if timeout is None:
+			pool = _get_callable_pool()
+			result = pool.submit(_run_callable_worker, callable_path, metadata).result()
+		else:
+			# The shared pool cannot stop one running task without killing its neighbours.
+			result = _run_timed_callable(callable_path, metadata, timeout)
+	except (BrokenProcessPool, EOFError):
+		if pool is not None:
+			_discard_callable_pool(pool)
 		return {
-			"status": "timeout",
+			"status": "failed",
 			"stdout": "",
-			"stderr": "Callable execution exceeded timeout",
+			"stderr": "Callable produced no output",
 			"duration": human_readable_duration(time.monotonic() - started),
-			"exit_code": None,
+			"exit_code": 1,
 		}
-
-	process.join()
-	if not result_queue.empty():
-		result = result_queue.get()
-		status = "success" if result["exit_code"] == 0 else "failed"
+	if result is None:
 		return {
-			"status": status,
-			"stdout": result.get("stdout", ""),
-			"stderr": result.get("stderr", ""),
+			"status": "timeout",
+			"stdout": "",
+			"stderr": "Callable execution exceeded timeout",
 			"duration": human_readable_duration(time.monotonic() - started),
-			"exit_code": result.get("exit_code"),
+			"exit_code": None,
 		}
 
+	status = "success" if result["exit_code"] == 0 else "failed"
 	return {
-		"status": "failed",
-		"stdout": "",
-		"stderr": "Callable produced no output",
+		"status": status,
+		"stdout": result["stdout"].decode("utf-8") if result["exit_code"] == 0 else "",
+		"stderr": result["stderr"],
 		"duration": human_readable_duration(time.monotonic() - started),
-		"exit_code": 1,
+		"exit_code": result["exit_code"],
 	}
@@ -2,16 +2,100 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import bisect
+import heapq
 import os
+import re
 import threading
 import time
-from queue import Queue, Empty
-from typing import Dict, Optional, Protocol
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import count, islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
 
+import msgpack
+import orjson
 import redis
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
 
-from .utils import retry_backoff
+from .dag import DAG
+
+
+_SCAN_BATCH = 1000
+
+# Run blueprints are only read while a run's tasks execute, so they expire instead of
+# accumulating forever; runs still executing after this long lose downstream scheduling.
+BLUEPRINT_TTL_SECONDS = int(os.getenv("BLUEPRINT_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+def _encode_json(value: Any) -> bytes:
+	return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _encode_msgpack(value: Any) -> bytes:
+	return msgpack.packb(value, use_bin_type=True)
+
+
+# Redis value codecs, selected with REDIS_CODEC. Encoders return bytes, which
+# redis-py sends as-is.
+_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+	"json": _encode_json,
+	"msgpack": _encode_msgpack,
+}
+
+
+def _decode(payload: bytes) -> Any:
+	"""Decode a stored value written by either codec.
+
+	Every stored value is a mapping: JSON ones start with ``{`` while msgpack maps
+	start with a map marker byte, so records from both codecs can be read during
+	a rollout without a separate tag byte.
+	"""
+
+	if payload[:1] == b"{":
+		return orjson.loads(payload)
+	return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+_GLOB_SPECIAL = re.compile(r"([*?\[\]\\])")
+
+
+def _escape_glob(value: str) -> str:
+	"""Escape Redis glob metacharacters so ``value`` matches literally."""
+
+	return _GLOB_SPECIAL.sub(r"\\\1", value)
+
+
+def _attempt_order(key: str) -> Tuple[int, int, str]:
+	"""Sort key placing ``<base>:<attempt>`` keys in numeric attempt order."""
+
+	suffix = key.rpartition(":")[2]
+	if suffix.isdigit():
+		return (0, int(suffix), "")
+	return (1, 0, suffix)
+
+
+def _is_canonical_record(key: str, record: dict) -> bool:
+	"""Whether ``record`` is stored under its task's ``<run_id>:<task_id>`` key.
+
+	Decided from the record's own ids, since task ids may themselves look like attempt
+	numbers; records written without ids fall back to the key's shape.
+	"""
+
+	run_id = record.get("run_id")
+	task_id = record.get("task_id")
+	if run_id is not None and task_id is not None:
+		return key == f"{run_id}:{task_id}"
+	return not key.rpartition(":")[2].isdigit()
+
+
+@lru_cache(maxsize=256)
+def _parse_dag(dag_json: str | bytes) -> DAG:
+	"""Parse stored DAG JSON, reusing the validated model while the content is unchanged."""
+
+	return DAG.model_validate_json(dag_json)
 
 
 class QueueInterface(Protocol):
@@ -27,68 +111,147 @@ class QueueInterface(Protocol):
 class PersistenceProtocol(QueueInterface, Protocol):
 	"""Full persistence contract used across the application."""
 
-	def save_dag(self, dag_id: str, dag_json: str) -> None:
+	# Durable backends receive serialized DAGs (batched by the API); others keep model objects.
+	durable: bool
+
+	def save_dag(self, dag_id: str, dag_json: str | bytes) -> None:
 		...
 
-	def load_dag(self, dag_id: str) -> Optional[str]:
+	def load_dag(self, dag_id: str) -> Optional[str | bytes]:
+		...
+
+	def save_dag_obj(self, dag_id: str, dag: DAG) -> None:
+		...
+
+	def load_dag_obj(self, dag_id: str) -> Optional[DAG]:
+		...
+
+	def save_dags(self, dags: Dict[str, str | bytes]) -> None:
+		...
+
+	def save_run_blueprint(self, run_id: str, blueprint: Dict[str, dict]) -> None:
+		...
+
+	def load_run_blueprint(self, run_id: str) -> Optional[Dict[str, dict]]:
 		...
 
 	def push_task_queue(self, item: dict) -> None:
 		...
 
+	def push_task_queue_many(self, items: List[dict], statuses: Iterable[Tuple[str, str, dict]] = ()) -> None:
+		"""Enqueue ``items``, first saving ``statuses`` in the same round trip."""
+		...
+
 	def pop_task_queue(self, timeout: int = 5) -> Optional[dict]:
 		...
 
+	def pop_task_queue_many(self, max_items: int, timeout: int = 5) -> List[dict]:
+		"""Block up to ``timeout`` for one item, then take up to ``max_items`` in total."""
+		...
+
 	def save_task_status(self, task_run_id: str, status: str, meta: dict) -> None:
 		...
 
+	def save_task_statuses(self, updates: Iterable[Tuple[str, str, dict]]) -> None:
+		...
+
 	def get_task_status(self, task_run_id: str) -> dict:
 		...
 
+	def get_task_statuses(self, task_run_ids: List[str]) -> List[dict]:
+		...
+
+	def list_dag_ids(self) -> List[str]:
+		...
+
+	def scan_runs(self, limit: int) -> List[dict]:
+		...
+
+	def scan_task_retries(self, base_key: str) -> List[dict]:
+		...
+
+	def metrics_snapshot(self) -> dict:
+		...
+
+	def data_version(self) -> Optional[int]:
+		...
+
 
 class RedisPersistence(PersistenceProtocol):
 	"""Redis-backed persistence implementation."""
 
+	durable = True
+
 	def __init__(
 		self,
 		redis_url: str,
 		queue_key: str = "orchestrator:tasks",
 		dag_prefix: str = "orchestrator:dag:",
 		status_prefix: str = "orchestrator:status:",
+		blueprint_prefix: str = "orchestrator:blueprint:",
+		codec: str | None = None,
+		max_connections: int | None = None,
+		blueprint_ttl_seconds: int = BLUEPRINT_TTL_SECONDS,
 	) -> None:
+		codec = codec or os.getenv("REDIS_CODEC", "msgpack")
+		if codec not in _ENCODERS:
+			raise ValueError(f"Unsupported REDIS_CODEC '{codec}'; expected one of {sorted(_ENCODERS)}")
+		self._encode = _ENCODERS[codec]
 		self.redis_url = redis_url
 		self.queue_key = queue_key
 		self.dag_prefix = dag_prefix
 		self.status_prefix = status_prefix
+		self.blueprint_prefix = blueprint_prefix
+		self.blueprint_ttl_seconds = blueprint_ttl_seconds
+		self.max_connections = max_connections
+		self._blmpop_supported = True
 		self._client = self._connect()
 
 	def _connect(self) -> redis.Redis:
-		last_exc: Exception | None = None
-		for attempt in range(3):
-			try:
-				client = redis.Redis.from_url(self.redis_url, decode_responses=True)
-				client.ping()
-				return client
-			except redis.RedisError as exc:  # pragma: no cover - integration
-				last_exc = exc
-				time.sleep(min(retry_backoff(attempt), 10))
-		raise ConnectionError("Unable to connect to Redis") from last_exc
+		# redis-py retries and reconnects inside the pool with exponential backoff and
+		# health-checks idle connections, so no Python-level retry loop is needed here.
+		client = redis.Redis.from_url(
+			self.redis_url,
+			max_connections=self.max_connections,
+			retry=Retry(ExponentialBackoff(cap=10, base=1), 3),
+			retry_on_error=[redis.ConnectionError, redis.TimeoutError],
+			health_check_interval=30,
+		)
+		try:
+			client.ping()
+		except redis.RedisError as exc:  # pragma: no cover - integration
+			raise ConnectionError("Unable to connect to Redis") from exc
+		return client
 
 	@property
 	def client(self) -> redis.Redis:
-		try:
-			self._client.ping()
-		except redis.RedisError:  # pragma: no cover - integration
-			self._client = self._connect()
 		return self._client
 
 	# DAG storage ---------------------------------------------------------
-	def save_dag(self, dag_id: str, dag_json: str) -> None:
+	def save_dag(self, dag_id: str, dag_json: str | bytes) -> None:
 		self.client.set(f"{self.dag_prefix}{dag_id}", dag_json)
 
-	def load_dag(self, dag_id: str) -> Optional[str]:
-		value = self.client.get(f"{self.dag_prefix}{dag_id}")
-		return str(value) if value else None
+	def load_dag(self, dag_id: str) -> Optional[str | bytes]:
+		return self.client.get(f"{self.dag_prefix}{dag_id}") or None
+
+	def save_dag_obj(self, dag_id: str, dag: DAG) -> None:
+		self.save_dag(dag_id, dag.to_json_bytes())
+
+	def load_dag_obj(self, dag_id: str) -> Optional[DAG]:
+		dag_json = self.load_dag(dag_id)
+		return _parse_dag(dag_json) if dag_json else None
+
+	def save_dags(self, dags: Dict[str, str | bytes]) -> None:
+		if dags:
+			self.client.mset({f"{self.dag_prefix}{dag_id}": dag_json for dag_id, dag_json in dags.items()})
+
+	# Run blueprints ------------------------------------------------------
+	def save_run_blueprint(self, run_id: str, blueprint: Dict[str, dict]) -> None:
+		self.client.set(f"{self.blueprint_prefix}{run_id}", self._encode(blueprint), ex=self.blueprint_ttl_seconds)
+
+	def load_run_blueprint(self, run_id: str) -> Optional[Dict[str, dict]]:
+		payload = self.client.get(f"{self.blueprint_prefix}{run_id}")
+		return _decode(payload) if payload else None
 
 	# Task queue ----------------------------------------------------------
 	def push(self, item: dict) -> None:
@@ -98,41 +261,235 @@ class RedisPersistence(PersistenceProtocol):
 		return self.pop_task_queue(timeout)
 
 	def push_task_queue(self, item: dict) -> None:
-		self.client.lpush(self.queue_key, json.dumps(item))
+		self.client.lpush(self.queue_key, self._encode(item))
+
+	def push_task_queue_many(self, items: List[dict], statuses: Iterable[Tuple[str, str, dict]] = ()) -> None:
+		pipe = self.client.pipeline(transaction=False)
+		self._status_records(statuses, pipe.mset)
+		# One variadic LPUSH keeps FIFO order for BRPOP
+		if items:
+			pipe.lpush(self.queue_key, *(self._encode(item) for item in items))
+		if len(pipe):
+			pipe.execute()
 
 	def pop_task_queue(self, timeout: int = 5) -> Optional[dict]:
 		result = self.client.brpop(self.queue_key, timeout=timeout)
 		if result is None:
 			return None
 		_, payload = result
-		return json.loads(payload)
+		return _decode(payload)
+
+	def pop_task_queue_many(self, max_items: int, timeout: int = 5) -> List[dict]:
+		if max_items <= 1 or not self._blmpop_supported:
+			return self._pop_many_fallback(max_items, timeout)
+		try:
+			result = self.client.blmpop(timeout, 1, self.queue_key, direction="RIGHT", count=max_items)
+		except redis.ResponseError:
+			# BLMPOP needs Redis 7; remember so older servers skip straight to the fallback
+			self._blmpop_supported = False
+			return self._pop_many_fallback(max_items, timeout)
+		if result is None:
+			return []
+		_, payloads = result
+		return [_decode(payload) for payload in payloads]
+
+	def _pop_many_fallback(self, max_items: int, timeout: int) -> List[dict]:
+		first = self.pop_task_queue(timeout)
+		if first is None:
+			return []
+		if max_items <= 1:
+			return [first]
+		pipe = self.client.pipeline(transaction=False)
+		for _ in range(max_items - 1):
+			pipe.rpop(self.queue_key)
+		return [first, *(_decode(payload) for payload in pipe.execute() if payload)]
 
 	# Task status ---------------------------------------------------------
 	def save_task_status(self, task_run_id: str, status: str, meta: dict) -> None:
 		payload = {"status": status, **meta}
-		self.client.set(f"{self.status_prefix}{task_run_id}", json.dumps(payload))
+		self.client.set(f"{self.status_prefix}{task_run_id}", self._encode(payload))
+
+	def save_task_statuses(self, updates: Iterable[Tuple[str, str, dict]]) -> None:
+		self._status_records(updates, self.client.mset)
+
+	def _status_records(self, updates: Iterable[Tuple[str, str, dict]], mset: Callable[[dict], Any]) -> None:
+		# A record saved under its attempt key and its canonical key shares one meta
+		# dict; encode it once and write every key in a single MSET.
+		records: Dict[str, bytes] = {}
+		# Values keep ``meta`` alive so its id cannot be reused within this call
+		encoded: Dict[Tuple[str, int], Tuple[dict, bytes]] = {}
+		for task_run_id, status, meta in updates:
+			cache_key = (status, id(meta))
+			entry = encoded.get(cache_key)
+			if entry is None:
+				entry = encoded[cache_key] = (meta, self._encode({"status": status, **meta}))
+			records[f"{self.status_prefix}{task_run_id}"] = entry[1]
+		if records:
+			mset(records)
 
 	def get_task_status(self, task_run_id: str) -> dict:
 		payload = self.client.get(f"{self.status_prefix}{task_run_id}")
-		return json.loads(payload) if payload else {}
+		return _decode(payload) if payload else {}
+
+	def get_task_statuses(self, task_run_ids: List[str]) -> List[dict]:
+		if not task_run_ids:
+			return []
+		payloads = self.client.mget([f"{self.status_prefix}{key}" for key in task_run_ids])
+		return [_decode(payload) if payload else {} for payload in payloads]
+
+	# Listings and metrics ------------------------------------------------
+	def list_dag_ids(self) -> List[str]:
+		prefix_len = len(self.dag_prefix)
+		return [key[prefix_len:] for key in self._scan(f"{_escape_glob(self.dag_prefix)}*")]
+
+	def scan_runs(self, limit: int) -> List[dict]:
+		run_prefix = f"{self.status_prefix}run:"
+		keys = list(self._scan(f"{_escape_glob(run_prefix)}*"))
+		prefix_len = len(run_prefix)
+		runs: List[dict] = []
+		for start in range(0, len(keys), _SCAN_BATCH):
+			batch = keys[start:start + _SCAN_BATCH]
+			runs.extend(
+				{"run_id": key[prefix_len:], **_decode(payload)}
+				for key, payload in zip(batch, self.client.mget(batch))
+				if payload
+			)
+		# SCAN order is arbitrary; list newest first like the in-memory backend
+		return heapq.nlargest(limit, runs, key=lambda run: run.get("created_at", 0))
+
+	def scan_task_retries(self, base_key: str) -> List[dict]:
+		parent = f"{self.status_prefix}{base_key}"
+		keys = sorted(
+			(key for key in self._scan(f"{_escape_glob(parent)}:*") if key.rpartition(":")[0] == parent),
+			key=_attempt_order,
+		)
+		if not keys:
+			return []
+		payloads = self.client.mget(keys)
+		prefix_len = len(self.status_prefix)
+		return [
+			{"task_run_id": key[prefix_len:], **_decode(payload)}
+			for key, payload in zip(keys, payloads)
+			if payload
+		]
+
+	def metrics_snapshot(self) -> dict:
+		client = self.client
+		prefix_len = len(self.status_prefix)
+		runs_total = 0
+		task_keys: List[str] = []
+		for key in self._scan(f"{_escape_glob(self.status_prefix)}*"):
+			name = key[prefix_len:]
+			if name.startswith("run:"):
+				runs_total += 1
+			elif ":" in name:
+				task_keys.append(key)
+
+		counts: Counter[str] = Counter()
+		for start in range(0, len(task_keys), _SCAN_BATCH):
+			batch = task_keys[start:start + _SCAN_BATCH]
+			records = (
+				(key[prefix_len:], _decode(payload)) for key, payload in zip(batch, client.mget(batch)) if payload
+			)
+			# Each task is counted once, by its canonical record
+			counts.update(
+				record.get("status", "unknown") for name, record in records if _is_canonical_record(name, record)
+			)
+
+		return {
+			"dags_registered": len(self.list_dag_ids()),
+			"runs_total": runs_total,
+			"tasks_by_status": dict(counts),
+			"queue_depth": client.llen(self.queue_key),
+		}
+
+	def data_version(self) -> Optional[int]:
+		# Writes come from many processes; no cheap shared version is tracked.
+		return None
+
+	def _scan(self, pattern: str) -> Iterator[str]:
+		# Values stay raw bytes for the codec; only keys are decoded for slicing and sorting
+		return (key.decode("utf-8") for key in self.client.scan_iter(match=pattern, count=_SCAN_BATCH))
 
 
 class InMemoryPersistence(PersistenceProtocol):
 	"""Thread-safe in-memory persistence for fast unit tests."""
 
-	def __init__(self) -> None:
-		self._queue: Queue[dict] = Queue()
-		self._dags: Dict[str, str] = {}
-		self._statuses: Dict[str, dict] = {}
+	durable = False
+
+	def __init__(self, blueprint_ttl_seconds: float = BLUEPRINT_TTL_SECONDS) -> None:
+		self._queue: Deque[dict] = deque()
+		self._queue_nonempty = threading.Event()
+		# Validated DAG models are kept as-is; JSON is only produced when load_dag asks for it.
+		self._dags: Dict[str, str | bytes | DAG] = {}
+		# Run id -> (expiry deadline, blueprint); insertion order is expiry order
+		self._blueprints: Dict[str, Tuple[float, Dict[str, dict]]] = {}
+		self._blueprint_ttl_seconds = blueprint_ttl_seconds
+		# Run records (keyed by run id) and task records are routed to separate stores
+		# on write so listings never need to filter keys by prefix.
+		self._run_statuses: Dict[str, dict] = {}
+		self._task_statuses: Dict[str, dict] = {}
+		# Secondary indexes maintained on write so read endpoints avoid full scans.
+		self._task_status_counts: Counter[str] = Counter()
+		self._task_retry_index: Dict[str, List[str]] = {}
+		# Bumped on every mutation so readers can detect unchanged data cheaply.
+		self._version = 0
+		self._versions = count(1)
 		self._lock = threading.Lock()
 
-	def save_dag(self, dag_id: str, dag_json: str) -> None:
+	def save_dag(self, dag_id: str, dag_json: str | bytes) -> None:
 		with self._lock:
 			self._dags[dag_id] = dag_json
+			self._bump_version()
+
+	def load_dag(self, dag_id: str) -> Optional[str | bytes]:
+		with self._lock:
+			dag = self._dags.get(dag_id)
+		return dag.to_json_bytes() if isinstance(dag, DAG) else dag
 
-	def load_dag(self, dag_id: str) -> Optional[str]:
+	def save_dag_obj(self, dag_id: str, dag: DAG) -> None:
+		with self._lock:
+			self._dags[dag_id] = dag
+			self._bump_version()
+
+	def load_dag_obj(self, dag_id: str) -> Optional[DAG]:
+		with self._lock:
+			stored = self._dags.get(dag_id)
+		if stored is None or isinstance(stored, DAG):
+			return stored
+		dag = DAG.model_validate_json(stored)
 		with self._lock:
-			return self._dags.get(dag_id)
+			# Keep the parsed model unless the DAG was replaced meanwhile
+			if self._dags.get(dag_id) is stored:
+				self._dags[dag_id] = dag
+		return dag
+
+	def save_dags(self, dags: Dict[str, str | bytes]) -> None:
+		with self._lock:
+			self._dags.update(dags)
+			self._bump_version()
+
+	def save_run_blueprint(self, run_id: str, blueprint: Dict[str, dict]) -> None:
+		# Copy the task dicts so queued payloads that share them can be mutated freely
+		stored = {task_id: dict(task) for task_id, task in blueprint.items()}
+		now = time.monotonic()
+		with self._lock:
+			blueprints = self._blueprints
+			# Evict expired blueprints from the front; the rest are younger
+			while blueprints:
+				oldest = next(iter(blueprints))
+				if blueprints[oldest][0] > now:
+					break
+				del blueprints[oldest]
+			blueprints.pop(run_id, None)
+			blueprints[run_id] = (now + self._blueprint_ttl_seconds, stored)
+
+	def load_run_blueprint(self, run_id: str) -> Optional[Dict[str, dict]]:
+		with self._lock:
+			entry = self._blueprints.get(run_id)
+		if entry is None or entry[0] <= time.monotonic():
+			return None
+		return entry[1]
 
 	def push(self, item: dict) -> None:
 		self.push_task_queue(item)
@@ -141,21 +498,215 @@ class InMemoryPersistence(PersistenceProtocol):
 		return self.pop_task_queue(timeout)
 
 	def push_task_queue(self, item: dict) -> None:
-		self._queue.put_nowait(item)
+		self._queue.append(item)
+		self._queue_nonempty.set()
+		self._bump_version()
+
+	def push_task_queue_many(self, items: List[dict], statuses: Iterable[Tuple[str, str, dict]] = ()) -> None:
+		self.save_task_statuses(statuses)
+		if not items:
+			return
+		self._queue.extend(items)
+		self._queue_nonempty.set()
+		self._bump_version()
 
 	def pop_task_queue(self, timeout: int = 5) -> Optional[dict]:
-		try:
-			return self._queue.get(timeout=timeout)
-		except Empty:
-			return None
+		item = self._popleft(timeout)
+		if item is not None:
+			self._bump_version()
+		return item
+
+	def pop_task_queue_many(self, max_items: int, timeout: int = 5) -> List[dict]:
+		first = self._popleft(timeout)
+		if first is None:
+			return []
+		items = [first]
+		queue = self._queue
+		while len(items) < max_items:
+			try:
+				items.append(queue.popleft())
+			except IndexError:
+				break
+		self._bump_version()
+		return items
+
+	def _popleft(self, timeout: float) -> Optional[dict]:
+		# deque.append/popleft are atomic, so the event is only touched when the queue runs dry
+		deadline = time.monotonic() + timeout
+		while True:
+			try:
+				return self._queue.popleft()
+			except IndexError:
+				pass
+			remaining = deadline - time.monotonic()
+			if remaining <= 0:
+				return None
+			# Clear, then re-check, so a push racing with the clear is never missed
+			self._queue_nonempty.clear()
+			if not self._queue:
+				self._queue_nonempty.wait(remaining)
 
 	def save_task_status(self, task_run_id: str, status: str, meta: dict) -> None:
 		with self._lock:
-			self._statuses[task_run_id] = {"status": status, **meta}
+			self._store_status(task_run_id, {"status": status, **meta})
+			self._bump_version()
+
+	def save_task_statuses(self, updates: Iterable[Tuple[str, str, dict]]) -> None:
+		with self._lock:
+			for task_run_id, status, meta in updates:
+				self._store_status(task_run_id, {"status": status, **meta})
+			self._bump_version()
 
 	def get_task_status(self, task_run_id: str) -> dict:
+		status = self._lookup_status(task_run_id)
+		return dict(status) if status else {}
+
+	def get_task_statuses(self, task_run_ids: List[str]) -> List[dict]:
+		lookup = self._lookup_status
+		return [dict(status) if status else {} for status in map(lookup, task_run_ids)]
+
+	def list_dag_ids(self) -> List[str]:
+		with self._lock:
+			return list(self._dags)
+
+	def scan_runs(self, limit: int) -> List[dict]:
+		with self._lock:
+			return [
+				{"run_id": run_id, **self._run_statuses[run_id]}
+				for run_id in islice(reversed(self._run_statuses), limit)
+			]
+
+	def scan_task_retries(self, base_key: str) -> List[dict]:
 		with self._lock:
-			return self._statuses.get(task_run_id, {})
+			return [
+				{"task_run_id": key, **self._task_statuses[key]}
+				for key in self._task_retry_index.get(base_key, ())
+			]
+
+	def metrics_snapshot(self) -> dict:
+		with self._lock:
+			return {
+				"dags_registered": len(self._dags),
+				"runs_total": len(self._run_statuses),
+				"tasks_by_status": dict(self._task_status_counts),
+				"queue_depth": len(self._queue),
+			}
+
+	def data_version(self) -> Optional[int]:
+		return self._version
+
+	def _bump_version(self) -> None:
+		# next() on itertools.count is atomic, so queue operations bump it without the store lock
+		self._version = next(self._versions)
+
+	def _lookup_status(self, task_run_id: str) -> Optional[dict]:
+		# Lock-free: a single dict.get is atomic, and stored records are only ever
+		# replaced (callers receive copies), so a reader never sees a partial record.
+		if task_run_id.startswith("run:"):
+			return self._run_statuses.get(task_run_id[len("run:"):])
+		return self._task_statuses.get(task_run_id)
+
+	def _store_status(self, task_run_id: str, payload: dict) -> None:
+		# Caller must hold ``self._lock``.
+		if task_run_id.startswith("run:"):
+			self._run_statuses[task_run_id[len("run:"):]] = payload
+			return
+		previous = self._task_statuses.get(task_run_id)
+		self._task_statuses[task_run_id] = payload
+		if ":" not in task_run_id:
+			return
+		if previous is None:
+			parent, _, _ = task_run_id.rpartition(":")
+			bisect.insort(self._task_retry_index.setdefault(parent, []), task_run_id, key=_attempt_order)
+		# Each task is counted once, by its canonical record
+		if previous is not None and _is_canonical_record(task_run_id, previous):
+			old_status = previous.get("status", "unknown")
+			self._task_status_counts[old_status] -= 1
+			if not self._task_status_counts[old_status]:
+				del self._task_status_counts[old_status]
+		if _is_canonical_record(task_run_id, payload):
+			self._task_status_counts[payload.get("status", "unknown")] += 1
+
+
+class DagWriteBatcher:
+	"""Coalesce concurrent DAG writes into one ``save_dags`` call per flush window."""
+
+	def __init__(self, persistence: PersistenceProtocol, max_batch: int = 64, window_seconds: float = 0.01) -> None:
+		self.persistence = persistence
+		self.max_batch = max_batch
+		self.window_seconds = window_seconds
+		# ``None`` is the stop sentinel; writes queued ahead of it are still flushed
+		self._queue: asyncio.Queue[Tuple[str, str | bytes, asyncio.Future[None]] | None] = asyncio.Queue()
+		self._task: asyncio.Task[None] | None = None
+
+	@property
+	def running(self) -> bool:
+		return self._task is not None and not self._task.done()
+
+	def start(self) -> None:
+		if not self.running:
+			self._task = asyncio.create_task(self._run())
+
+	async def stop(self) -> None:
+		"""Flush every write queued so far, then stop the flush loop."""
+
+		if self._task is None:
+			return
+		task, self._task = self._task, None
+		await self._queue.put(None)
+		await task
+
+	async def save_dag(self, dag_id: str, dag_json: str | bytes) -> None:
+		"""Queue a DAG write and wait until its batch has been persisted."""
+
+		if not self.running:
+			await asyncio.to_thread(self.persistence.save_dags, {dag_id: dag_json})
+			return
+		future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+		await self._queue.put((dag_id, dag_json, future))
+		await future
+
+	async def _run(self) -> None:
+		batch: List[Tuple[str, str | bytes, asyncio.Future[None]]] = []
+		try:
+			while True:
+				item = await self._queue.get()
+				if item is None:
+					return
+				batch = [item]
+				# Let concurrent writers join the batch, then take what has arrived
+				await asyncio.sleep(self.window_seconds)
+				stopping = False
+				while len(batch) < self.max_batch and not self._queue.empty():
+					item = self._queue.get_nowait()
+					if item is None:
+						stopping = True
+						break
+					batch.append(item)
+				await self._flush(batch)
+				batch = []
+				if stopping:
+					return
+		finally:
+			# Only reached with writes outstanding if the loop itself was cancelled
+			while not self._queue.empty():
+				item = self._queue.get_nowait()
+				if item is not None:
+					batch.append(item)
+			for _, _, future in batch:
+				future.cancel()
+
+	async def _flush(self, batch: List[Tuple[str, str | bytes, asyncio.Future[None]]]) -> None:
+		try:
+			await asyncio.to_thread(self.persistence.save_dags, {dag_id: dag_json for dag_id, dag_json, _ in batch})
+		except Exception as exc:
+			for _, _, future in batch:
+				if not future.done():
+					future.set_exception(exc)
+			return
+		for _, _, future in batch:
+			if not future.done():
+				future.set_result(None)
 
 
 def get_persistence_from_env() -> PersistenceProtocol:
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import copy
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, List, Tuple
 
-from .dag import DAG, build_run_tasks
+from .dag import DAG, build_run_tasks, task_queue_ref
 from .persistence import PersistenceProtocol
 from .utils import setup_logging
 
@@ -22,45 +22,36 @@ class Scheduler:
 		self.persistence = persistence
 
 	def schedule_dag(self, dag: DAG, run_id: str) -> None:
-		"""Validate DAG and enqueue tasks that are dependency-free."""
+		"""Enqueue the dependency-free tasks of an already validated and stored DAG."""
 
-		dag.validate()
 		tasks = build_run_tasks(dag, run_id)
-		blueprint: Dict[str, dict] = {task["task_id"]: copy.deepcopy(task) for task in tasks}
-
-		runnable: List[dict] = []
-		for task in tasks:
-			task["dag_blueprint"] = blueprint
-			task["attempt"] = 0
-			task["task_run_id"] = f"{run_id}:{task['task_id']}:0"
-			if not task["dependencies"]:
-				runnable.append(task)
+		# Stored once per run; workers fetch it to build downstream payloads
+		blueprint: Dict[str, dict] = {task["task_id"]: task for task in tasks}
+		runnable: List[dict] = [task for task in tasks if not task["dependencies"]]
 
 		run_metadata = {
 			"dag_id": dag.id,
 			"run_id": run_id,
 			"task_count": len(tasks),
 			"task_ids": list(dag.tasks.keys()),
+			"created_at": time.time(),
 		}
 		LOGGER.info("Scheduling DAG %s run %s with %d tasks", dag.id, run_id, len(tasks))
 
-		self.persistence.save_dag(dag.id, dag.model_dump_json())
-		self._persist_run(run_id, run_metadata)
+		self.persistence.save_run_blueprint(run_id, blueprint)
 
+		# Run record, queued statuses and root tasks go out in one batch
+		updates: List[Tuple[str, str, dict]] = [(f"run:{run_id}", "scheduled", run_metadata)]
 		for task in runnable:
-			LOGGER.debug("Enqueueing initial task %s", task["task_id"])
 			meta = {
 				"task_id": task["task_id"],
 				"run_id": run_id,
 				"task_run_id": task["task_run_id"],
 			}
-			self.persistence.save_task_status(task["task_run_id"], "queued", meta)
-			self.persistence.save_task_status(f"{run_id}:{task['task_id']}", "queued", meta)
-			self.persistence.push_task_queue(task)
+			# Only the canonical key; the attempt key is first written when the task runs
+			updates.append((task["canonical_key"], "queued", meta))
+		if LOGGER.isEnabledFor(logging.DEBUG):
+			LOGGER.debug("Enqueueing %d initial tasks for run %s", len(runnable), run_id)
+		self.persistence.push_task_queue_many([task_queue_ref(task) for task in runnable], updates)
 
 		# TODO: extend persistence of dependent tasks or metadata for richer scheduling.
-
-	def _persist_run(self, run_id: str, metadata: Dict[str, int | str]) -> None:
-		key = f"run:{run_id}"
-		if hasattr(self.persistence, "save_task_status"):
-			self.persistence.save_task_status(key, "scheduled", metadata)
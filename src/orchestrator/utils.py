@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import importlib
 import logging
+from functools import lru_cache
 from typing import Any, Callable
 
 
@@ -24,16 +25,28 @@ def human_readable_duration(seconds: float) -> str:
 	return f"{rem:.3f}s"
 
 
-def retry_backoff(attempt: int, base_delay: float = 2.0) -> float:
+_DEFAULT_BASE_DELAY = 2.0
+# Delays for the default base, which every caller in the package uses
+_DEFAULT_BACKOFF = tuple(_DEFAULT_BASE_DELAY * (2**attempt) for attempt in range(16))
+
+
+def retry_backoff(attempt: int, base_delay: float = _DEFAULT_BASE_DELAY) -> float:
 	"""Return exponential backoff delay for the given attempt."""
 
+	if base_delay == _DEFAULT_BASE_DELAY and 0 <= attempt < len(_DEFAULT_BACKOFF):
+		return _DEFAULT_BACKOFF[attempt]
 	if attempt < 0:
 		raise ValueError("Attempt must be non-negative")
 	return base_delay * (2**attempt)
 
 
+@lru_cache(maxsize=256)
 def safe_import(callable_path: str) -> Callable[..., Any]:
-	"""Import a callable from ``module:attr`` or ``module.attr`` notation."""
+	"""Import a callable from ``module:attr`` or ``module.attr`` notation.
+
+	Successful lookups are memoized per path; failures are not cached and raise on
+	every call.
+	"""
 
 	if not callable_path:
 		raise ValueError("callable_path must be provided")
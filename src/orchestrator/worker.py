@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-import copy
+import asyncio
 import logging
 import time
-from typing import Any, Callable, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
 
+from .dag import task_queue_ref
 from .executor import execute_task
 from .persistence import PersistenceProtocol
 from .utils import retry_backoff, setup_logging
@@ -16,6 +20,15 @@ LOGGER = logging.getLogger(__name__)
 setup_logging()
 
 
+def _canonical_key(payload: Mapping[str, Any]) -> str:
+	"""Return the ``<run_id>:<task_id>`` status key, precomputed by ``build_run_tasks``."""
+
+	key = payload.get("canonical_key")
+	if key is None:  # payloads queued before the key was precomputed
+		key = f"{payload['run_id']}:{payload['task_id']}"
+	return key
+
+
 class Worker:
 	"""Polls the task queue and executes runnable tasks."""
 
@@ -23,9 +36,15 @@ class Worker:
 		self,
 		persistence: PersistenceProtocol,
 		executor: Callable[[Dict[str, Any], Optional[int]], Dict[str, Any]] = execute_task,
+		batch_size: int = 1,
 	) -> None:
 		self.persistence = persistence
 		self.executor = executor
+		# Tasks claimed per queue round trip. Opt-in: claimed tasks wait behind this worker's
+		# retry sleeps, are held back from idle workers and are lost if the worker crashes.
+		self.batch_size = batch_size
+		# Blueprints never change once a run is scheduled, so each is fetched once per worker
+		self._run_blueprint = lru_cache(maxsize=128)(self._load_blueprint)
 
 	def run(self, loop_forever: bool = True) -> None:
 		"""Start the worker loop."""
@@ -33,18 +52,26 @@ class Worker:
 		LOGGER.info("Worker started; loop_forever=%s", loop_forever)
 		try:
 			while True:
-				payload = self.persistence.pop_task_queue(timeout=5)
-				if not payload:
+				payloads = self.persistence.pop_task_queue_many(self.batch_size, timeout=5)
+				if not payloads:
 					if not loop_forever:
 						break
 					continue
 
-				LOGGER.info("Executing task %s", payload["task_run_id"])
-				self._process_task(payload)
+				log_tasks = LOGGER.isEnabledFor(logging.INFO)
+				for payload in payloads:
+					if log_tasks:
+						LOGGER.info("Executing task %s", payload["task_run_id"])
+					self._process_task(payload)
 		except KeyboardInterrupt:  # pragma: no cover - manual interruption
 			LOGGER.info("Worker shutdown requested")
 
-	def _process_task(self, payload: Dict[str, Any]) -> None:
+	def _process_task(self, item: Dict[str, Any]) -> None:
+		payload = self._resolve_payload(item)
+		if payload is None:
+			LOGGER.error("No blueprint for run %s; dropping task %s", item["run_id"], item["task_run_id"])
+			self._record_status(item["task_run_id"], item, "failed", {"stderr": "Run blueprint not found"})
+			return
 		task_run_id = payload["task_run_id"]
 		timeout = payload.get("timeout_seconds")
 		self._record_status(task_run_id, payload, "running", {})
@@ -70,9 +97,8 @@ class Worker:
 			)
 			time.sleep(delay)
 			payload["attempt"] = next_attempt
-			payload["task_run_id"] = f"{payload['run_id']}:{payload['task_id']}:{next_attempt}"
-			self._mark_queued(payload)
-			self.persistence.push_task_queue(payload)
+			payload["task_run_id"] = f"{_canonical_key(payload)}:{next_attempt}"
+			self.persistence.push_task_queue_many([task_queue_ref(payload)], self._queued_statuses(payload))
 		else:
 			LOGGER.error("Task %s failed after %s attempts", task_run_id, attempt)
 
@@ -80,6 +106,9 @@ class Worker:
 		downstream = payload.get("downstream", [])
 		if not downstream:
 			return
+		children: List[Dict[str, Any]] = []
+		updates: List[Tuple[str, str, dict]] = []
+		log_children = LOGGER.isEnabledFor(logging.DEBUG)
 		for child in downstream:
 			child_payload = self._build_child_payload(payload, child)
 			if not child_payload:
@@ -88,12 +117,31 @@ class Worker:
 				continue
 			if self._already_scheduled(child_payload):
 				continue
-			LOGGER.debug("Enqueueing downstream task %s", child)
-			self._mark_queued(child_payload)
-			self.persistence.push_task_queue(child_payload)
+			if log_children:
+				LOGGER.debug("Enqueueing downstream task %s", child)
+			children.append(task_queue_ref(child_payload))
+			updates.extend(self._queued_statuses(child_payload))
+		if children:
+			self.persistence.push_task_queue_many(children, updates)
+
+	def _resolve_payload(self, item: Dict[str, Any]) -> Dict[str, Any] | None:
+		# Items queued before payloads became blueprint references are already complete
+		if "command" in item or "callable" in item:
+			legacy_blueprint = item.get("dag_blueprint")
+			if legacy_blueprint and self._run_blueprint(item["run_id"]) is None:
+				# Children and retries are queued as references, so the run needs a stored blueprint
+				self.persistence.save_run_blueprint(item["run_id"], legacy_blueprint)
+				self._run_blueprint.cache_clear()
+			return item
+		blueprint = self._run_blueprint(item["run_id"])
+		template = blueprint.get(item["task_id"]) if blueprint else None
+		if template is None:
+			return None
+		return {**template, **item}
 
 	def _build_child_payload(self, parent_payload: Dict[str, Any], child_id: str) -> Dict[str, Any] | None:
-		blueprint = parent_payload.get("dag_blueprint")
+		# Payloads queued before blueprints were stored per run still embed one
+		blueprint = parent_payload.get("dag_blueprint") or self._run_blueprint(parent_payload["run_id"])
 		if not blueprint:
 			LOGGER.debug("Missing blueprint; cannot schedule downstream task %s", child_id)
 			return None
@@ -101,18 +149,22 @@ class Worker:
 		if not child_base:
 			LOGGER.debug("Blueprint does not contain task %s", child_id)
 			return None
-		child_payload = copy.deepcopy(child_base)
-		child_payload["attempt"] = 0
-		child_payload["task_run_id"] = f"{child_payload['run_id']}:{child_id}:0"
-		child_payload["dag_blueprint"] = blueprint
-		return child_payload
+		# Only top-level keys are ever reassigned, so a shallow merge of the template suffices
+		return {**child_base, "attempt": 0, "task_run_id": f"{_canonical_key(child_base)}:0"}
+
+	def _load_blueprint(self, run_id: str) -> Mapping[str, Mapping[str, Any]] | None:
+		blueprint = self.persistence.load_run_blueprint(run_id)
+		if blueprint is None:
+			return None
+		# Cached templates are shared by every child payload, so expose them read-only
+		return {task_id: MappingProxyType(task) for task_id, task in blueprint.items()}
 
 	def _dependencies_satisfied(self, run_id: str, child_payload: Dict[str, Any]) -> bool:
-		for dep in child_payload.get("dependencies", []):
-			status = self.persistence.get_task_status(f"{run_id}:{dep}")
-			if status.get("status") != "success":
-				return False
-		return True
+		dependencies = child_payload.get("dependencies", [])
+		if not dependencies:
+			return True
+		statuses = self.persistence.get_task_statuses([f"{run_id}:{dep}" for dep in dependencies])
+		return all(status.get("status") == "success" for status in statuses)
 
 	def _record_status(
 		self,
@@ -122,16 +174,78 @@ class Worker:
 		meta: Dict[str, Any],
 	) -> None:
 		enriched_meta = {**meta, "task_id": payload["task_id"], "run_id": payload["run_id"]}
-		self.persistence.save_task_status(task_run_id, status, enriched_meta)
-		canonical_key = f"{payload['run_id']}:{payload['task_id']}"
-		self.persistence.save_task_status(canonical_key, status, enriched_meta)
+		self.persistence.save_task_statuses(
+			[(task_run_id, status, enriched_meta), (_canonical_key(payload), status, enriched_meta)]
+		)
 
 	def _already_scheduled(self, payload: Dict[str, Any]) -> bool:
-		status = self.persistence.get_task_status(f"{payload['run_id']}:{payload['task_id']}")
+		status = self.persistence.get_task_status(_canonical_key(payload))
 		return status.get("status") in {"queued", "running", "success"}
 
-	def _mark_queued(self, payload: Dict[str, Any]) -> None:
+	def _queued_statuses(self, payload: Dict[str, Any]) -> List[Tuple[str, str, dict]]:
 		meta = {"task_id": payload["task_id"], "run_id": payload["run_id"], "task_run_id": payload["task_run_id"]}
-		canonical_key = f"{payload['run_id']}:{payload['task_id']}"
-		self.persistence.save_task_status(payload["task_run_id"], "queued", meta)
-		self.persistence.save_task_status(canonical_key, "queued", meta)
+		# The canonical record carries task_run_id, so the attempt key is first written on "running"
+		return [(_canonical_key(payload), "queued", meta)]
+
+
+class AsyncWorker:
+	"""Runs up to ``concurrency`` tasks at once so their I/O waits overlap.
+
+	Task lifecycles are the synchronous :class:`Worker` steps executed on a dedicated
+	pool of ``concurrency`` threads, plus one for the blocking queue pop, so the loop's
+	default executor never caps concurrency; the event loop only claims work and tracks
+	what is in flight.
+	"""
+
+	def __init__(
+		self,
+		persistence: PersistenceProtocol,
+		executor: Callable[[Dict[str, Any], Optional[int]], Dict[str, Any]] = execute_task,
+		concurrency: int = 8,
+		poll_timeout: int = 5,
+	) -> None:
+		self.persistence = persistence
+		self.concurrency = concurrency
+		self.poll_timeout = poll_timeout
+		self._worker = Worker(persistence, executor)
+
+	async def run(self, loop_forever: bool = True) -> None:
+		"""Claim and execute tasks until the queue is drained (or forever)."""
+
+		LOGGER.info("Async worker started; concurrency=%s loop_forever=%s", self.concurrency, loop_forever)
+		loop = asyncio.get_running_loop()
+		threads = ThreadPoolExecutor(max_workers=self.concurrency + 1, thread_name_prefix="async-worker")
+		in_flight: Set[asyncio.Future[None]] = set()
+		try:
+			while True:
+				free = self.concurrency - len(in_flight)
+				if free == 0:
+					done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+					for task in done:
+						task.result()
+					continue
+
+				# Poll briefly while tasks run so finished slots are refilled promptly
+				timeout = min(1, self.poll_timeout) if in_flight else self.poll_timeout
+				payloads = await loop.run_in_executor(threads, self.persistence.pop_task_queue_many, free, timeout)
+				if not payloads:
+					if in_flight:
+						# Running tasks may still enqueue their downstream work
+						done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+						for task in done:
+							task.result()
+						continue
+					if not loop_forever:
+						break
+					continue
+
+				log_tasks = LOGGER.isEnabledFor(logging.INFO)
+				for payload in payloads:
+					if log_tasks:
+						LOGGER.info("Executing task %s", payload["task_run_id"])
+					in_flight.add(loop.run_in_executor(threads, self._worker._process_task, payload))
+		finally:
+			if in_flight:
+				await asyncio.gather(*in_flight, return_exceptions=True)
+			# A pop cut short by cancellation finishes on its own within poll_timeout
+			threads.shutdown(wait=False)
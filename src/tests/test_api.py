@@ -1,10 +1,13 @@
 """Tests for the FastAPI surface."""
 
+import asyncio
+import json
 from collections.abc import Iterator
 
 import pytest
 from fastapi.testclient import TestClient
 
+from orchestrator import api
 from orchestrator.api import app, get_persistence
 from orchestrator.scheduler import Scheduler
 from orchestrator.persistence import InMemoryPersistence
@@ -62,3 +65,299 @@ def test_trigger_run_invokes_scheduler(monkeypatch: pytest.MonkeyPatch, client:
 	assert response.status_code == 200
 	assert response.json()["run_id"]
 	assert called["dag_id"] == "sample"
+
+
+def test_upload_dag_json(client: TestClient) -> None:
+	response = client.post(
+		"/dags/upload",
+		files={"file": ("sample.json", json.dumps(_dag_payload()).encode(), "application/json")},
+	)
+	assert response.status_code == 200
+	assert response.json()["dag_id"] == "sample"
+
+
+def test_upload_dag_rejects_invalid_json(client: TestClient) -> None:
+	response = client.post("/dags/upload", files={"file": ("broken.json", b"{not json", "application/json")})
+	assert response.status_code == 400
+	assert response.json()["detail"].startswith("Invalid JSON")
+
+
+def test_upload_dag_yaml(client: TestClient) -> None:
+	content = b"""
+id: sample
+name: Sample DAG
+tasks:
+  task_a:
+    id: task_a
+    name: Task A
+    command: echo A
+"""
+	response = client.post("/dags/upload", files={"file": ("sample.yaml", content, "application/x-yaml")})
+	assert response.status_code == 200
+	assert response.json()["dag_id"] == "sample"
+
+
+def test_metrics_and_runs_reflect_scheduled_run(client: TestClient) -> None:
+	client.post("/dags", json=_dag_payload())
+	run_id = client.post("/dags/sample/run").json()["run_id"]
+
+	runs = client.get("/runs").json()
+	assert [run["run_id"] for run in runs["runs"]] == [run_id]
+
+	metrics = client.get("/metrics").json()
+	assert metrics["runs_total"] == 1
+	assert metrics["dags_registered"] == 1
+	assert metrics["tasks_by_status"] == {"queued": 1}
+
+
+def test_runs_rejects_negative_limit(client: TestClient) -> None:
+	assert client.get("/runs?limit=-1").status_code == 422
+	assert client.get("/runs?limit=0").json() == {"runs": [], "count": 0}
+
+
+def test_task_retries_lists_attempts_in_order(client: TestClient) -> None:
+	persistence = app.state.persistence
+	for attempt in (1, 0):
+		persistence.save_task_status(f"run-1:task_a:{attempt}", "failed", {"task_id": "task_a"})
+	persistence.save_task_status("run-1:task_a", "failed", {"task_id": "task_a"})
+
+	response = client.get("/tasks/run-1:task_a:1/retries")
+	assert response.status_code == 200
+	body = response.json()
+	assert body["count"] == 2
+	assert [entry["task_run_id"] for entry in body["retries"]] == ["run-1:task_a:0", "run-1:task_a:1"]
+
+
+def test_queued_attempt_visible_before_it_runs(client: TestClient) -> None:
+	client.post("/dags", json=_dag_payload())
+	run_id = client.post("/dags/sample/run").json()["run_id"]
+
+	response = client.get(f"/tasks/{run_id}:task_a:0")
+	assert response.status_code == 200
+	assert response.json()["status"] == "queued"
+	assert client.get(f"/tasks/{run_id}:task_a:1").status_code == 404
+
+	body = client.get(f"/tasks/{run_id}:task_a:0/retries").json()
+	assert [entry["task_run_id"] for entry in body["retries"]] == [f"{run_id}:task_a:0"]
+
+
+def test_metrics_count_each_task_once(client: TestClient) -> None:
+	persistence = app.state.persistence
+	done = {"task_id": "task_a", "run_id": "run-1", "task_run_id": "run-1:task_a:0"}
+	persistence.save_task_statuses([("run-1:task_a:0", "success", done), ("run-1:task_a", "success", done)])
+	queued = {"task_id": "task_b", "run_id": "run-1", "task_run_id": "run-1:task_b:0"}
+	persistence.save_task_statuses([("run-1:task_b", "queued", queued)])
+
+	assert client.get("/metrics").json()["tasks_by_status"] == {"success": 1, "queued": 1}
+
+	persistence.save_task_statuses([("run-1:task_b:0", "running", queued), ("run-1:task_b", "running", queued)])
+	assert client.get("/metrics").json()["tasks_by_status"] == {"success": 1, "running": 1}
+
+
+def test_dashboard_served_as_html(client: TestClient) -> None:
+	response = client.get("/")
+	assert response.status_code == 200
+	assert response.headers["content-type"].startswith("text/html")
+	assert "<!DOCTYPE html>" in response.text
+
+
+def test_dashboard_served_precompressed(client: TestClient) -> None:
+	response = client.get("/", headers={"Accept-Encoding": "gzip"})
+	assert response.status_code == 200
+	assert response.headers["content-encoding"] == "gzip"
+	assert "<!DOCTYPE html>" in response.text
+
+	plain = client.get("/", headers={"Accept-Encoding": "identity"})
+	assert "content-encoding" not in plain.headers
+
+
+def test_cancel_run_marks_pending_tasks_cancelled(client: TestClient) -> None:
+	client.post("/dags", json=_dag_payload())
+	run_id = client.post("/dags/sample/run").json()["run_id"]
+
+	response = client.post(f"/runs/{run_id}/cancel")
+	assert response.status_code == 200
+
+	run = client.get(f"/runs/{run_id}").json()
+	assert run["metadata"]["status"] == "cancelled"
+	statuses = {task["task_id"]: task["status"] for task in run["tasks"]}
+	assert statuses == {"task_a": "cancelled", "task_b": "pending"}
+	assert client.get("/metrics").json()["tasks_by_status"] == {"cancelled": 1}
+
+
+def test_trigger_run_reparses_dag_after_update(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+	client.post("/dags", json=_dag_payload())
+	client.post("/dags/sample/run")
+
+	updated = _dag_payload()
+	updated["name"] = "Renamed DAG"
+	client.post("/dags", json=updated)
+
+	seen = []
+	monkeypatch.setattr(Scheduler, "schedule_dag", lambda self, dag, run_id: seen.append(dag.name))
+	client.post("/dags/sample/run")
+	assert seen == ["Renamed DAG"]
+
+
+def test_trigger_run_reuses_registered_dag_model(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+	client.post("/dags", json=_dag_payload())
+	stored = app.state.persistence.load_dag_obj("sample")
+
+	seen = []
+	monkeypatch.setattr(Scheduler, "schedule_dag", lambda self, dag, run_id: seen.append(dag))
+	client.post("/dags/sample/run")
+	assert seen == [stored]
+	assert seen[0] is stored
+	assert json.loads(app.state.persistence.load_dag("sample"))["id"] == "sample"
+
+
+class _DurableMemoryPersistence(InMemoryPersistence):
+	"""In-memory store that reports itself durable so DAG writes go through the batcher."""
+
+	durable = True
+
+	def __init__(self) -> None:
+		super().__init__()
+		self.batches: list[dict] = []
+
+	def save_dags(self, dags: dict) -> None:
+		self.batches.append(dict(dags))
+		super().save_dags(dags)
+
+
+def test_register_dag_batches_writes_during_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
+	persistence = _DurableMemoryPersistence()
+	monkeypatch.setattr(api, "get_persistence_from_env", lambda: persistence)
+	with TestClient(app) as lifespan_client:
+		assert app.state.dag_writer.running
+		response = lifespan_client.post("/dags", json=_dag_payload())
+		assert response.status_code == 200
+		assert persistence.load_dag("sample") is not None
+	assert not app.state.dag_writer.running
+	assert [list(batch) for batch in persistence.batches] == [["sample"]]
+
+
+def test_upload_dag_rejects_oversized_file(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+	monkeypatch.setattr(api, "MAX_DAG_UPLOAD_BYTES", 16)
+	payload = json.dumps(_dag_payload()).encode()
+	response = client.post("/dags/upload", files={"file": ("sample.json", payload, "application/json")})
+	assert response.status_code == 413
+	assert app.state.persistence.load_dag("sample") is None
+
+
+def test_trigger_run_reuses_scheduler(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+	client.post("/dags", json=_dag_payload())
+
+	schedulers = []
+	monkeypatch.setattr(Scheduler, "schedule_dag", lambda self, dag, run_id: schedulers.append(self))
+	client.post("/dags/sample/run")
+	client.post("/dags/sample/run")
+	assert len(schedulers) == 2
+	assert schedulers[0] is schedulers[1]
+	assert schedulers[0].persistence is app.state.persistence
+
+
+def test_listings_support_conditional_get(client: TestClient) -> None:
+	client.post("/dags", json=_dag_payload())
+
+	first = client.get("/dags")
+	etag = first.headers["etag"]
+	assert client.get("/dags", headers={"If-None-Match": etag}).status_code == 304
+
+	client.post("/dags/sample/run")
+	refreshed = client.get("/metrics", headers={"If-None-Match": etag})
+	assert refreshed.status_code == 200
+	assert refreshed.headers["etag"] != etag
+
+
+def test_metrics_cached_within_ttl(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+	persistence = app.state.persistence
+	monkeypatch.setattr(persistence, "data_version", lambda: None)
+	calls = []
+	original = persistence.metrics_snapshot
+	monkeypatch.setattr(persistence, "metrics_snapshot", lambda: calls.append(1) or original())
+
+	first = client.get("/metrics").json()
+	second = client.get("/metrics").json()
+	assert first == second
+	assert len(calls) == 1
+
+
+def test_upload_dag_rejects_unsupported_extension(client: TestClient) -> None:
+	response = client.post("/dags/upload", files={"file": ("sample.txt", b"id: sample", "text/plain")})
+	assert response.status_code == 400
+	assert response.json()["detail"].startswith("Unsupported file format")
+
+
+def test_upload_dag_rejects_non_mapping_document(client: TestClient) -> None:
+	response = client.post("/dags/upload", files={"file": ("sample.yaml", b"- just\n- a list\n", "application/x-yaml")})
+	assert response.status_code == 400
+	assert response.json()["detail"].startswith("Invalid DAG")
+
+
+def test_post_dag_rejects_cycle(client: TestClient) -> None:
+	payload = _dag_payload()
+	payload["tasks"]["task_a"]["dependencies"] = ["task_b"]
+	response = client.post("/dags", json=payload)
+	assert response.status_code == 422
+	assert app.state.persistence.load_dag("sample") is None
+
+
+def test_list_runs_returns_most_recent_first(client: TestClient) -> None:
+	client.post("/dags", json=_dag_payload())
+	run_ids = [client.post("/dags/sample/run").json()["run_id"] for _ in range(3)]
+
+	runs = client.get("/runs", params={"limit": 2}).json()
+	assert [run["run_id"] for run in runs["runs"]] == run_ids[:0:-1]
+
+
+def test_dashboard_revalidates_with_etag(client: TestClient) -> None:
+	first = client.get("/")
+	etag = first.headers["etag"]
+	second = client.get("/", headers={"If-None-Match": etag})
+	assert second.status_code == 304
+	assert second.content == b""
+
+
+def test_task_retries_order_attempts_numerically(client: TestClient) -> None:
+	persistence = app.state.persistence
+	for attempt in (10, 2, 1, 0):
+		persistence.save_task_status(f"run-1:task_a:{attempt}", "failed", {"task_id": "task_a"})
+
+	body = client.get("/tasks/run-1:task_a:0/retries").json()
+	assert [entry["task_run_id"] for entry in body["retries"]] == [
+		"run-1:task_a:0",
+		"run-1:task_a:1",
+		"run-1:task_a:2",
+		"run-1:task_a:10",
+	]
+
+
+def test_event_stream_emits_only_on_change(monkeypatch: pytest.MonkeyPatch) -> None:
+	monkeypatch.setattr(api, "_EVENTS_POLL_SECONDS", 0)
+	persistence = InMemoryPersistence()
+
+	class _Request:
+		polls = 0
+
+		async def is_disconnected(self) -> bool:
+			self.polls += 1
+			if self.polls == 3:
+				persistence.save_dag("sample", json.dumps(_dag_payload()))
+			return self.polls > 4
+
+	async def collect() -> list:
+		return [chunk async for chunk in api._event_stream(_Request(), persistence)]
+
+	events = asyncio.run(collect())
+	assert len(events) == 2
+	assert all(event.startswith(b"data: ") and event.endswith(b"\n\n") for event in events)
+	assert json.loads(events[1][len(b"data: "):])["dags_registered"] == 1
+
+
+def test_etag_changes_across_process_epochs(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+	etag = client.get("/dags").headers["etag"]
+	monkeypatch.setattr(api, "_ETAG_EPOCH", "restarted")
+	response = client.get("/dags", headers={"If-None-Match": etag})
+	assert response.status_code == 200
+	assert response.headers["etag"] != etag
@@ -23,26 +23,80 @@ def test_topological_sort_simple() -> None:
 
 
 def test_cycle_detection() -> None:
-	dag = DAG(
+	with pytest.raises(ValueError, match="contains a cycle"):
+		DAG(
+			id="cycle",
+			name="Cycle",
+			tasks={
+				"task_a": Task(id="task_a", name="A", command="echo A", dependencies=["task_c"]),
+				"task_b": Task(id="task_b", name="B", command="echo B", dependencies=["task_a"]),
+				"task_c": Task(id="task_c", name="C", command="echo C", dependencies=["task_b"]),
+			},
+		)
+
+
+def test_validate_detects_cycle_on_unvalidated_dag() -> None:
+	dag = DAG.model_construct(
 		id="cycle",
 		name="Cycle",
 		tasks={
-			"task_a": Task(id="task_a", name="A", command="echo A", dependencies=["task_c"]),
+			"task_a": Task(id="task_a", name="A", command="echo A", dependencies=["task_b"]),
 			"task_b": Task(id="task_b", name="B", command="echo B", dependencies=["task_a"]),
-			"task_c": Task(id="task_c", name="C", command="echo C", dependencies=["task_b"]),
 		},
 	)
 	with pytest.raises(CycleError):
 		dag.validate()
 
 
+def test_models_are_frozen() -> None:
+	dag = _simple_dag()
+	with pytest.raises(ValueError):
+		dag.name = "Renamed"
+	assert dag.tasks["task_b"].dependencies == ("task_a",)
+
+
 def test_missing_dependency() -> None:
-	dag = DAG(
-		id="missing",
-		name="Missing",
-		tasks={
-			"task_a": Task(id="task_a", name="A", command="echo A", dependencies=["task_x"]),
-		},
-	)
 	with pytest.raises(ValueError, match="undefined dependencies"):
+		DAG(
+			id="missing",
+			name="Missing",
+			tasks={
+				"task_a": Task(id="task_a", name="A", command="echo A", dependencies=["task_x"]),
+			},
+		)
+
+
+def test_to_json_bytes_round_trips() -> None:
+	dag = _simple_dag()
+	payload = dag.to_json_bytes()
+	assert isinstance(payload, bytes)
+	assert DAG.model_validate_json(payload) == dag
+
+
+def test_downstream_adjacency_is_memoized() -> None:
+	dag = _simple_dag()
+	assert dag.downstream == {"task_a": ("task_b",), "task_b": ("task_c",), "task_c": ()}
+	assert dag.downstream is dag.downstream
+	assert dag.topological_order is dag.topological_order
+	assert "downstream" not in dag.model_dump()
+
+
+def test_validate_rechecks_tasks_changed_in_place() -> None:
+	dag = _simple_dag()
+	dag.topological_sort()
+	dag.tasks["task_a"] = Task(id="task_a", name="A", command="echo A", dependencies=["task_c"])
+	with pytest.raises(CycleError):
 		dag.validate()
+
+
+def test_model_copy_drops_memoized_graph() -> None:
+	dag = _simple_dag()
+	assert dag.topological_order == ("task_a", "task_b", "task_c")
+	tasks = {
+		"task_a": Task(id="task_a", name="A", command="echo A", dependencies=["task_b"]),
+		"task_b": Task(id="task_b", name="B", command="echo B"),
+	}
+	copied = dag.model_copy(update={"tasks": tasks})
+	assert copied.downstream == {"task_a": (), "task_b": ("task_a",)}
+	assert copied.topological_sort() == ["task_b", "task_a"]
+	assert dag.topological_order == ("task_a", "task_b", "task_c")
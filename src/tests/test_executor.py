@@ -0,0 +1,114 @@
+"""Tests for task execution."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from orchestrator.executor import _call_with_metadata, _encode_output, execute_task
+
+
+def _sleepy(seconds: float) -> str:
+	time.sleep(seconds)
+	return "done"
+
+
+def test_plain_command_runs_without_shell() -> None:
+	result = execute_task({"command": 'echo "A"'}, timeout=10)
+	assert result["status"] == "success"
+	assert result["stdout"] == "A\n"
+
+
+def test_shell_syntax_command_runs_through_shell() -> None:
+	result = execute_task({"command": "echo A && echo B | tr B C"}, timeout=10)
+	assert result["status"] == "success"
+	assert result["stdout"] == "A\nC\n"
+
+
+def test_missing_executable_reports_shell_failure() -> None:
+	result = execute_task({"command": "definitely-not-a-real-binary"}, timeout=10)
+	assert result["status"] == "failed"
+	assert result["exit_code"] == 127
+
+
+def test_command_timeout() -> None:
+	result = execute_task({"command": "sleep 5"}, timeout=1)
+	assert result["status"] == "timeout"
+
+
+def test_callable_success() -> None:
+	result = execute_task({"callable": "os:getpid", "metadata": {}}, timeout=10)
+	assert result["status"] == "success"
+	assert result["stdout"].isdigit()
+
+
+def test_callable_timeout_then_pool_recovers() -> None:
+	result = execute_task({"callable": "test_executor:_sleepy", "metadata": {"seconds": 5}}, timeout=1)
+	assert result["status"] == "timeout"
+
+	result = execute_task({"callable": "test_executor:_sleepy", "metadata": {"seconds": 0}}, timeout=10)
+	assert result["status"] == "success"
+	assert result["stdout"] == '"done"'
+
+
+def test_callable_timeout_leaves_concurrent_callables_running() -> None:
+	with ThreadPoolExecutor(max_workers=2) as threads:
+		healthy = threads.submit(execute_task, {"callable": "test_executor:_sleepy", "metadata": {"seconds": 2}}, 10)
+		stuck = threads.submit(execute_task, {"callable": "test_executor:_sleepy", "metadata": {"seconds": 5}}, 1)
+		assert stuck.result()["status"] == "timeout"
+		result = healthy.result()
+	assert result["status"] == "success"
+	assert result["stdout"] == '"done"'
+
+
+def test_untimed_callable_uses_shared_pool() -> None:
+	result = execute_task({"callable": "test_executor:_sleepy", "metadata": {"seconds": 0}}, timeout=None)
+	assert result["status"] == "success"
+	assert result["stdout"] == '"done"'
+
+
+def test_callable_calling_sys_exit_reports_failure() -> None:
+	for timeout in (None, 10):
+		result = execute_task({"callable": "sys:exit", "metadata": {}}, timeout=timeout)
+		assert result["status"] == "failed"
+		assert result["exit_code"] == 1
+		assert "SystemExit" in result["stderr"]
+
+
+def test_encode_output_handles_non_json_types() -> None:
+	assert _encode_output({1: date(2024, 1, 2), "amount": Decimal("1.5")}) == b'{"1":"2024-01-02","amount":"1.5"}'
+	assert _encode_output(2**70) == str(2**70).encode()
+
+
+def test_call_with_metadata_dispatches_on_signature() -> None:
+	def keywords(region: str) -> str:
+		return region
+
+	def whole(config: dict) -> dict:
+		return config
+
+	assert _call_with_metadata(keywords, {"region": "eu"}) == "eu"
+	assert _call_with_metadata(whole, {"region": "eu"}) == {"region": "eu"}
+	assert _call_with_metadata(dict, {"region": "eu"}) == {"region": "eu"}
+
+
+def test_non_executable_script_reports_failure(tmp_path: Path) -> None:
+	script = tmp_path / "script.sh"
+	script.write_text("echo hi\n")
+	result = execute_task({"command": str(script)}, timeout=10)
+	assert result["status"] == "failed"
+	assert result["exit_code"] == 126
+
+	result = execute_task({"command": str(tmp_path)}, timeout=10)
+	assert result["status"] == "failed"
+	assert result["exit_code"] == 126
+
+
+def test_executable_script_without_shebang_runs_through_shell(tmp_path: Path) -> None:
+	script = tmp_path / "script.sh"
+	script.write_text("echo hi\n")
+	script.chmod(0o755)
+	result = execute_task({"command": str(script)}, timeout=10)
+	assert result["status"] == "success"
+	assert result["stdout"] == "hi\n"
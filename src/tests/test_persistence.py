@@ -0,0 +1,76 @@
+"""Tests for persistence helpers."""
+
+import asyncio
+import time
+from typing import Dict, List
+
+import pytest
+
+from orchestrator.persistence import _ENCODERS, DagWriteBatcher, InMemoryPersistence, _decode
+
+
+@pytest.mark.parametrize("codec", sorted(_ENCODERS))
+def test_codecs_round_trip_through_shared_decoder(codec: str) -> None:
+	value = {"status": "queued", "dependencies": ["a"], "metadata": {1: "x"}}
+	encoded = _ENCODERS[codec](value)
+	assert isinstance(encoded, bytes)
+	assert _decode(encoded)["dependencies"] == ["a"]
+	assert _decode(encoded)["status"] == "queued"
+
+
+class _RecordingPersistence(InMemoryPersistence):
+	durable = True
+
+	def __init__(self) -> None:
+		super().__init__()
+		self.batches: List[Dict[str, str | bytes]] = []
+
+	def save_dags(self, dags: Dict[str, str | bytes]) -> None:
+		self.batches.append(dict(dags))
+		super().save_dags(dags)
+
+
+def test_batcher_stop_flushes_queued_writes() -> None:
+	persistence = _RecordingPersistence()
+
+	async def scenario() -> None:
+		batcher = DagWriteBatcher(persistence, window_seconds=0.05)
+		batcher.start()
+		writes = [asyncio.create_task(batcher.save_dag(f"dag-{index}", "{}")) for index in range(3)]
+		await asyncio.sleep(0)
+		await batcher.stop()
+		await asyncio.wait_for(asyncio.gather(*writes), 1)
+		assert not batcher.running
+		await batcher.save_dag("late", "{}")
+
+	asyncio.run(scenario())
+	assert persistence.batches == [{"dag-0": "{}", "dag-1": "{}", "dag-2": "{}"}, {"late": "{}"}]
+
+
+def test_batcher_cancelled_loop_releases_writers() -> None:
+	async def scenario() -> None:
+		batcher = DagWriteBatcher(_RecordingPersistence(), window_seconds=1)
+		batcher.start()
+		write = asyncio.create_task(batcher.save_dag("dag", "{}"))
+		await asyncio.sleep(0.01)
+		assert batcher._task is not None
+		batcher._task.cancel()
+		with pytest.raises(asyncio.CancelledError):
+			await asyncio.wait_for(write, 1)
+
+	asyncio.run(scenario())
+
+
+def test_in_memory_blueprints_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+	clock = [100.0]
+	monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+	persistence = InMemoryPersistence(blueprint_ttl_seconds=10)
+	persistence.save_run_blueprint("run-1", {"a": {"task_id": "a"}})
+	clock[0] = 105.0
+	persistence.save_run_blueprint("run-2", {"a": {"task_id": "a"}})
+	assert persistence.load_run_blueprint("run-1") == {"a": {"task_id": "a"}}
+
+	clock[0] = 111.0
+	assert persistence.load_run_blueprint("run-1") is None
+	persistence.save_run_blueprint("run-3", {})
+	assert list(persistence._blueprints) == ["run-2", "run-3"]
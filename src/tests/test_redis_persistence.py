@@ -0,0 +1,140 @@
+"""Tests for the Redis persistence backend, run against fakeredis."""
+
+from collections.abc import Iterator
+
+import pytest
+import redis
+
+from orchestrator.dag import DAG, Task
+from orchestrator.persistence import _ENCODERS, RedisPersistence
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+	server = fakeredis.FakeServer()
+	monkeypatch.setattr(redis.Redis, "from_url", lambda url, **kwargs: fakeredis.FakeRedis(server=server))
+	yield
+
+
+@pytest.fixture()
+def persistence(fake_redis: None) -> RedisPersistence:
+	return RedisPersistence("redis://fake")
+
+
+def _dag() -> DAG:
+	return DAG(
+		id="demo",
+		name="Demo",
+		tasks={
+			"task_a": Task(id="task_a", name="A", command="echo A"),
+			"task_b": Task(id="task_b", name="B", command="echo B", dependencies=["task_a"]),
+		},
+	)
+
+
+@pytest.mark.parametrize("codec", sorted(_ENCODERS))
+def test_records_round_trip_with_each_codec(fake_redis: None, codec: str) -> None:
+	persistence = RedisPersistence("redis://fake", codec=codec)
+
+	persistence.save_dag_obj("demo", _dag())
+	assert persistence.load_dag_obj("demo") == _dag()
+	assert persistence.list_dag_ids() == ["demo"]
+
+	blueprint = {"task_a": {"task_id": "task_a", "dependencies": [], "metadata": {"region": "eu"}}}
+	persistence.save_run_blueprint("run-1", blueprint)
+	assert persistence.load_run_blueprint("run-1") == blueprint
+	assert 0 < persistence.client.ttl(f"{persistence.blueprint_prefix}run-1") <= persistence.blueprint_ttl_seconds
+
+	persistence.save_task_status("run-1:task_a:0", "running", {"task_id": "task_a"})
+	assert persistence.get_task_status("run-1:task_a:0") == {"status": "running", "task_id": "task_a"}
+	assert persistence.get_task_statuses(["run-1:task_a:0", "missing"]) == [
+		{"status": "running", "task_id": "task_a"},
+		{},
+	]
+
+
+def test_unknown_codec_is_rejected(fake_redis: None) -> None:
+	with pytest.raises(ValueError, match="Unsupported REDIS_CODEC"):
+		RedisPersistence("redis://fake", codec="pickle")
+
+
+def test_scan_runs_lists_newest_first(persistence: RedisPersistence) -> None:
+	for index in range(5):
+		persistence.save_task_status(f"run:run-{index}", "scheduled", {"created_at": float(index)})
+
+	runs = persistence.scan_runs(3)
+	assert [run["run_id"] for run in runs] == ["run-4", "run-3", "run-2"]
+	assert persistence.scan_runs(0) == []
+
+
+def test_scan_task_retries_orders_attempts_numerically(persistence: RedisPersistence) -> None:
+	for attempt in (10, 2, 0):
+		persistence.save_task_status(f"run-1:task_a:{attempt}", "failed", {})
+	persistence.save_task_status("run-1:task_a", "failed", {})
+	persistence.save_task_status("run-1:task_ab:0", "failed", {})
+
+	retries = persistence.scan_task_retries("run-1:task_a")
+	assert [entry["task_run_id"] for entry in retries] == ["run-1:task_a:0", "run-1:task_a:2", "run-1:task_a:10"]
+
+
+def test_push_many_writes_statuses_and_keeps_fifo_order(persistence: RedisPersistence) -> None:
+	meta = {"task_id": "task_a", "run_id": "run-1"}
+	persistence.push_task_queue_many(
+		[{"task_id": "task_a"}, {"task_id": "task_b"}],
+		[("run-1:task_a", "queued", meta), ("run-1:task_b", "queued", meta)],
+	)
+
+	assert persistence.get_task_status("run-1:task_b") == {"status": "queued", **meta}
+	assert persistence.pop_task_queue(timeout=1) == {"task_id": "task_a"}
+	assert persistence.pop_task_queue(timeout=1) == {"task_id": "task_b"}
+	assert persistence.pop_task_queue(timeout=1) is None
+
+
+def test_pop_many_uses_blmpop(persistence: RedisPersistence) -> None:
+	persistence.push_task_queue_many([{"n": index} for index in range(3)])
+
+	assert persistence.pop_task_queue_many(2, timeout=1) == [{"n": 0}, {"n": 1}]
+	assert persistence.pop_task_queue_many(2, timeout=1) == [{"n": 2}]
+	assert persistence._blmpop_supported
+
+
+def test_pop_many_falls_back_without_blmpop(monkeypatch: pytest.MonkeyPatch, persistence: RedisPersistence) -> None:
+	def unsupported(*args: object, **kwargs: object) -> None:
+		raise redis.ResponseError("unknown command 'BLMPOP'")
+
+	monkeypatch.setattr(persistence.client, "blmpop", unsupported)
+	persistence.push_task_queue_many([{"n": index} for index in range(3)])
+
+	assert persistence.pop_task_queue_many(2, timeout=1) == [{"n": 0}, {"n": 1}]
+	assert not persistence._blmpop_supported
+	assert persistence.pop_task_queue_many(5, timeout=1) == [{"n": 2}]
+
+
+def test_metrics_count_each_task_once(persistence: RedisPersistence) -> None:
+	persistence.save_dag_obj("demo", _dag())
+	persistence.save_task_status("run:run-1", "scheduled", {})
+	persistence.save_task_statuses(
+		[
+			("run-1:task_a:0", "success", {}),
+			("run-1:task_a", "success", {}),
+			("run-1:task_b", "queued", {}),
+		]
+	)
+	persistence.push_task_queue({"task_id": "task_b"})
+
+	assert persistence.metrics_snapshot() == {
+		"dags_registered": 1,
+		"runs_total": 1,
+		"tasks_by_status": {"success": 1, "queued": 1},
+		"queue_depth": 1,
+	}
+
+
+def test_metrics_count_numeric_task_ids(persistence: RedisPersistence) -> None:
+	for task_id in ("1", "2"):
+		meta = {"run_id": "run-1", "task_id": task_id}
+		persistence.save_task_statuses([(f"run-1:{task_id}:0", "success", meta), (f"run-1:{task_id}", "success", meta)])
+
+	assert persistence.metrics_snapshot()["tasks_by_status"] == {"success": 2}
@@ -1,5 +1,7 @@
 """Tests for the scheduler."""
 
+import threading
+
 from orchestrator.dag import DAG, Task
 from orchestrator.persistence import InMemoryPersistence
 from orchestrator.scheduler import Scheduler
@@ -25,6 +27,7 @@ def test_schedule_dag_enqueues_roots() -> None:
 	assert first is not None
 	assert first["task_id"] == "task_a"
 	assert persistence.pop_task_queue(timeout=0) is None
+	assert persistence.get_task_status("run-1:task_a")["status"] == "queued"
 
 
 def test_schedule_dag_all_independent_tasks_enqueued() -> None:
@@ -44,3 +47,43 @@ def test_schedule_dag_all_independent_tasks_enqueued() -> None:
 		persistence.pop_task_queue(timeout=0)["task_id"],
 	}
 	assert tasks == {"task_a", "task_b"}
+
+
+def test_push_task_queue_many_preserves_order_and_wakes_consumers() -> None:
+	persistence = InMemoryPersistence()
+	popped = []
+	consumer = threading.Thread(target=lambda: popped.append(persistence.pop_task_queue(timeout=2)))
+	consumer.start()
+	persistence.push_task_queue_many([{"n": 1}, {"n": 2}, {"n": 3}])
+	consumer.join()
+
+	assert popped == [{"n": 1}]
+	assert persistence.pop_task_queue(timeout=0) == {"n": 2}
+	assert persistence.pop_task_queue(timeout=0) == {"n": 3}
+
+
+def test_schedule_dag_stores_blueprint_once_per_run() -> None:
+	persistence = InMemoryPersistence()
+	Scheduler(persistence).schedule_dag(_build_dag(), run_id="run-3")
+
+	root = persistence.pop_task_queue(timeout=0)
+	assert root == {"run_id": "run-3", "task_id": "task_a", "task_run_id": "run-3:task_a:0", "attempt": 0}
+	blueprint = persistence.load_run_blueprint("run-3")
+	assert set(blueprint) == {"task_a", "task_b"}
+	assert blueprint["task_a"]["downstream"] == ("task_b",)
+
+
+def test_pop_task_queue_many_takes_available_items_up_to_limit() -> None:
+	persistence = InMemoryPersistence()
+	persistence.push_task_queue_many([{"n": 1}, {"n": 2}, {"n": 3}])
+
+	assert persistence.pop_task_queue_many(2, timeout=0) == [{"n": 1}, {"n": 2}]
+	assert persistence.pop_task_queue_many(2, timeout=0) == [{"n": 3}]
+	assert persistence.pop_task_queue_many(2, timeout=0) == []
+
+
+def test_schedule_dag_leaves_stored_dag_untouched() -> None:
+	persistence = InMemoryPersistence()
+	persistence.save_dag("demo", b'{"stored": true}')
+	Scheduler(persistence).schedule_dag(_build_dag(), run_id="run-4")
+	assert persistence.load_dag("demo") == b'{"stored": true}'
@@ -0,0 +1,133 @@
+"""Tests for the worker loop."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from orchestrator.dag import DAG, Task, build_run_tasks
+from orchestrator.persistence import InMemoryPersistence
+from orchestrator.scheduler import Scheduler
+from orchestrator.worker import AsyncWorker, Worker
+
+
+def _succeed(payload: dict, timeout: int | None) -> dict:
+	return {"status": "success", "stdout": payload["task_id"], "stderr": "", "exit_code": 0}
+
+
+def test_worker_runs_fan_in_dag_to_completion() -> None:
+	dag = DAG(
+		id="diamond",
+		name="Diamond",
+		tasks={
+			"root": Task(id="root", name="Root", command="echo root", metadata={"k": "v"}),
+			"left": Task(id="left", name="Left", command="echo left", dependencies=["root"]),
+			"right": Task(id="right", name="Right", command="echo right", dependencies=["root"]),
+			"join": Task(id="join", name="Join", command="echo join", dependencies=["left", "right"]),
+		},
+	)
+	persistence = InMemoryPersistence()
+	Scheduler(persistence).schedule_dag(dag, run_id="run-1")
+
+	worker = Worker(persistence, executor=_succeed)
+	executed = []
+	while (payload := persistence.pop_task_queue(timeout=0)) is not None:
+		executed.append(payload["task_id"])
+		worker._process_task(payload)
+
+	assert executed.count("join") == 1
+	assert set(executed) == {"root", "left", "right", "join"}
+	assert persistence.load_run_blueprint("run-1")["root"]["attempt"] == 0
+
+
+def test_async_worker_overlaps_independent_tasks() -> None:
+	tasks = {f"t{i}": Task(id=f"t{i}", name=f"T{i}", command="sleep") for i in range(4)}
+	tasks["join"] = Task(id="join", name="Join", command="echo", dependencies=list(tasks))
+	persistence = InMemoryPersistence()
+	Scheduler(persistence).schedule_dag(DAG(id="fan", name="Fan", tasks=tasks), run_id="run-1")
+
+	running = 0
+	peak = 0
+	lock = threading.Lock()
+
+	def _slow(payload: dict, timeout: int | None) -> dict:
+		nonlocal running, peak
+		with lock:
+			running += 1
+			peak = max(peak, running)
+		time.sleep(0.2)
+		with lock:
+			running -= 1
+		return _succeed(payload, timeout)
+
+	asyncio.run(AsyncWorker(persistence, executor=_slow, concurrency=4, poll_timeout=0).run(loop_forever=False))
+
+	assert peak == 4
+	assert persistence.get_task_status("run-1:join")["status"] == "success"
+
+
+def test_async_worker_does_not_share_the_default_executor() -> None:
+	tasks = {f"t{i}": Task(id=f"t{i}", name=f"T{i}", command="sleep") for i in range(4)}
+	persistence = InMemoryPersistence()
+	Scheduler(persistence).schedule_dag(DAG(id="fan", name="Fan", tasks=tasks), run_id="run-1")
+
+	barrier = threading.Barrier(4, timeout=5)
+
+	def _together(payload: dict, timeout: int | None) -> dict:
+		barrier.wait()
+		return _succeed(payload, timeout)
+
+	async def scenario() -> None:
+		# A one-thread default executor would deadlock the barrier if tasks ran on it
+		asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+		await AsyncWorker(persistence, executor=_together, concurrency=4, poll_timeout=0).run(loop_forever=False)
+
+	asyncio.run(scenario())
+	statuses = persistence.get_task_statuses([f"run-1:t{i}" for i in range(4)])
+	assert [status["status"] for status in statuses] == ["success"] * 4
+
+
+def test_metrics_count_numeric_task_ids() -> None:
+	dag = DAG(
+		id="numeric",
+		name="Numeric",
+		tasks={
+			"1": Task(id="1", name="One", command="echo 1"),
+			"2": Task(id="2", name="Two", command="echo 2", dependencies=["1"]),
+		},
+	)
+	persistence = InMemoryPersistence()
+	Scheduler(persistence).schedule_dag(dag, run_id="run-1")
+
+	worker = Worker(persistence, executor=_succeed)
+	while (payload := persistence.pop_task_queue(timeout=0)) is not None:
+		worker._process_task(payload)
+
+	assert persistence.metrics_snapshot()["tasks_by_status"] == {"success": 2}
+
+
+def test_worker_finishes_run_queued_with_embedded_blueprint() -> None:
+	dag = DAG(
+		id="chain",
+		name="Chain",
+		tasks={
+			"a": Task(id="a", name="A", command="echo a"),
+			"b": Task(id="b", name="B", command="echo b", dependencies=["a"]),
+			"c": Task(id="c", name="C", command="echo c", dependencies=["b"]),
+		},
+	)
+	# Payload shape queued before per-run blueprints were stored
+	tasks = {task["task_id"]: task for task in build_run_tasks(dag, "run-1")}
+	blueprint = {task_id: dict(task) for task_id, task in tasks.items()}
+	persistence = InMemoryPersistence()
+	persistence.push_task_queue({**tasks["a"], "dag_blueprint": blueprint})
+
+	worker = Worker(persistence, executor=_succeed)
+	executed = []
+	while (payload := persistence.pop_task_queue(timeout=0)) is not None:
+		executed.append(payload["task_id"])
+		worker._process_task(payload)
+
+	assert executed == ["a", "b", "c"]
+	statuses = persistence.get_task_statuses(["run-1:a", "run-1:b", "run-1:c"])
+	assert [status["status"] for status in statuses] == ["success", "success", "success"]